@@ -9,12 +9,14 @@ setup(
         "python-dotenv>=1.0.0",
         "openai>=1.12.0",
         "anthropic>=0.18.1",
-        "pandas>=2.0.0",
-        "numpy>=1.24.0",
         "pytest>=7.4.0",
         "pytest-cov>=4.1.0",
         "pytest-mock>=3.14.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.8.0"],
+        "data": ["pandas>=2.0.0", "numpy>=1.24.0"],
+    },
     python_requires=">=3.8",
     author="Brett Gray",
     description="Investment analysis and portfolio optimization tool",
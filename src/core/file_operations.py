@@ -6,6 +6,12 @@ import os
 import json
 from src.core.logger import logger
 
+# orjson is optional; it parses and serializes large API data files several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def save_json_data(data, filepath):
     """Save data to a JSON file.
 
@@ -20,8 +26,13 @@ def save_json_data(data, filepath):
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
         
-        with open(filepath, "w") as f:
-            json.dump(data, f, indent=2)
+        if orjson is not None:
+            with open(filepath, "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            # Same UTF-8 output as orjson, so the file does not depend on the extra
+            with open(filepath, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
         logger.info(f"Data saved to {filepath}")
         return True
     except Exception as e:
@@ -38,14 +49,20 @@ def load_json_data(filepath):
         dict: Loaded data, or None if loading failed.
     """
     try:
-        with open(filepath, "r") as f:
-            data = json.load(f)
+        if orjson is not None:
+            with open(filepath, "rb") as f:
+                data = orjson.loads(f.read())
+        else:
+            # orjson writes UTF-8, so read it as such regardless of the locale
+            with open(filepath, "r", encoding="utf-8") as f:
+                data = json.load(f)
         logger.info(f"Data loaded from {filepath}")
         return data
     except FileNotFoundError:
         logger.error(f"File {filepath} not found.")
         return None
     except json.JSONDecodeError:
+        # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
         logger.error(f"Error parsing JSON in {filepath}.")
         return None
     except Exception as e:
@@ -59,6 +76,21 @@ def save_markdown(markdown_content, filepath):
         markdown_content (str): Markdown content to save.
         filepath (str): Path to the file.
 
+    Returns:
+        bool: True if successful, False otherwise.
+    """
+    return save_markdown_stream([markdown_content], filepath)
+
+def save_markdown_stream(markdown_chunks, filepath):
+    """Save markdown content to a file chunk by chunk.
+
+    The chunks are written as they are produced, so the full document
+    never has to be held in memory as a single string.
+
+    Args:
+        markdown_chunks (iterable): Iterable of markdown strings to save.
+        filepath (str): Path to the file.
+
     Returns:
         bool: True if successful, False otherwise.
     """
@@ -67,9 +99,9 @@ def save_markdown(markdown_content, filepath):
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
         
         with open(filepath, "w") as f:
-            f.write(markdown_content)
+            f.writelines(markdown_chunks)
         logger.info(f"Markdown saved to {filepath}")
         return True
     except Exception as e:
         logger.error(f"Error saving markdown to {filepath}: {e}")
-        return False 
\ No newline at end of file
+        return False
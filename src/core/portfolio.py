@@ -2,115 +2,256 @@
 Portfolio data module for the portfolio analyzer.
 """
 
+import os
+import re
+import sys
+import mmap
+import functools
+from types import MappingProxyType
+from typing import NamedTuple
 from src.core.logger import logger
 from src.core.config import config
 
+# Captures the trimmed cells of every non-header row, with or without the closing pipe;
+# bytes so it can scan the mmap directly
+_PORTFOLIO_ROW_RE = re.compile(
+    rb'^\|(?![ \t]*:?-)(?![ \t]*Security[ \t]*\|)[ \t]*([^|\n]*[^|\s])[ \t]*\|'
+    rb'[ \t]*([^|\n]*?)[ \t]*\|[ \t]*([^|\n]*?)[ \t]*\|'
+    rb'[ \t]*([^|\n]*?)[ \t]*\|[ \t]*([^|\n]*?)%?[ \t\r]*(?:\||$)',
+    re.MULTILINE
+)
+
+class Stock(NamedTuple):
+    """A parsed portfolio row. Immutable, so cached rows can be shared."""
+    name: str
+    ticker: str
+    exchange: str
+    shares: int
+    current_price: float
+    market_value: float
+    weight: float
+
+# Parsed portfolios keyed by (path, mtime_ns, size); at most one entry per path
+_PORTFOLIO_CACHE = {}
+
 def parse_portfolio(portfolio_file=None):
     """Parse the portfolio data from a markdown file.
 
+    Results are cached per file path, modification time and size, so
+    repeated calls for an unchanged file cost a single stat call.
+
     Args:
         portfolio_file (str, optional): Path to the portfolio markdown file.
             If None, uses the path from the configuration.
 
     Returns:
-        list: List of stock dictionaries with name, shares, price, etc.
+        list: List of stock dictionaries with name, ticker, exchange, shares,
+            price, etc. Stocks without a ticker mapping are skipped.
     """
     if portfolio_file is None:
         portfolio_file = config["api"]["portfolio_file"]
     
     try:
-        with open(portfolio_file, "r") as f:
-            content = f.read()
+        path = os.fspath(portfolio_file)
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        cached_stocks = _PORTFOLIO_CACHE.get(key)
+        if cached_stocks is None:
+            cached_stocks = _parse_portfolio_file(path)
+            # Drop stale entries for this path before caching the new version
+            for stale_key in [k for k in _PORTFOLIO_CACHE if k[0] == path]:
+                del _PORTFOLIO_CACHE[stale_key]
+            _PORTFOLIO_CACHE[key] = cached_stocks
     except FileNotFoundError:
         logger.error(f"Portfolio file {portfolio_file} not found.")
         return []
     
+    # Callers get plain dicts, built fresh from the immutable cached rows
+    stocks = [stock._asdict() for stock in cached_stocks]
+    
+    logger.info(f"Found {len(stocks)} stocks in portfolio.")
+    return stocks
+
+def _parse_portfolio_file(portfolio_file):
+    """Read and parse a portfolio markdown file.
+
+    Args:
+        portfolio_file (str): Path to the portfolio markdown file.
+
+    Returns:
+        tuple: Tuple of Stock rows.
+    """
+    # I/O and allocation bound, so rows are built straight from the regex matches
     stocks = []
+    # Bound to locals for the row loop
+    append = stocks.append
+    lookup = get_stock_ticker_and_exchange
+    intern = sys.intern
     
-    for line in content.split('\n'):
-        if '|' in line and not line.startswith('|--') and "Cash EUR" not in line:
-            parts = [part.strip() for part in line.split('|')]
-            if len(parts) >= 6 and parts[1] != "Security" and "Cash" not in parts[1]:
+    with open(portfolio_file, "rb") as f:
+        # mmap cannot map an empty file
+        if os.fstat(f.fileno()).st_size == 0:
+            return ()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            # int()/float() accept bytes, so only the name is decoded
+            for match in _PORTFOLIO_ROW_RE.finditer(content):
+                name, shares, price, market_value, weight = match.groups()
+                
+                if b"Cash" in name:
+                    continue
+                # Interned so map lookups compare by identity
+                name = intern(name.decode("utf-8"))
+                
+                # Resolve the ticker once here so later stages can read it from the stock;
+                # the lookup already warns about unmapped names
+                stock_info = lookup(name)
+                if not stock_info:
+                    continue
+                
                 try:
-                    stocks.append({
-                        "name": parts[1].strip(),
-                        "shares": int(parts[2].strip()),
-                        "current_price": float(parts[3].strip()),
-                        "market_value": float(parts[4].strip().replace(',', '')),
-                        "weight": float(parts[5].strip().replace('%', ''))
-                    })
-                except (ValueError, IndexError) as e:
-                    logger.error(f"Error parsing line: {line}, Error: {e}")
+                    append(Stock(
+                        name,
+                        stock_info["ticker"],
+                        stock_info["exchange"],
+                        int(shares),
+                        float(price),
+                        float(market_value.replace(b',', b'')),
+                        float(weight)
+                    ))
+                except ValueError as e:
+                    logger.error(f"Error parsing row for {name}, Error: {e}")
     
-    logger.info(f"Found {len(stocks)} stocks in portfolio.")
-    return stocks
+    return tuple(stocks)
+
+# Shared, read-only ticker/exchange entries. Every name variant of a company
+# maps to the same object, so lookups never allocate and callers cannot
+# mutate the table through a returned value.
+_RHM = MappingProxyType({"ticker": "RHM", "exchange": "XTRA"})
+_BRK_B = MappingProxyType({"ticker": "BRK.B", "exchange": "NYSE"})
+_ALV = MappingProxyType({"ticker": "ALV", "exchange": "XTRA"})
+_GTLB = MappingProxyType({"ticker": "GTLB", "exchange": "NasdaqGS"})
+_NVDA = MappingProxyType({"ticker": "NVDA", "exchange": "NasdaqGS"})
+_MSFT = MappingProxyType({"ticker": "MSFT", "exchange": "NasdaqGS"})
+_GOOG = MappingProxyType({"ticker": "GOOG", "exchange": "NasdaqGS"})
+_CRWD = MappingProxyType({"ticker": "CRWD", "exchange": "NasdaqGS"})
+_AMD = MappingProxyType({"ticker": "AMD", "exchange": "NasdaqGS"})
+_NTNX = MappingProxyType({"ticker": "NTNX", "exchange": "NasdaqGS"})
+_ASML = MappingProxyType({"ticker": "ASML", "exchange": "NasdaqGS"})
+_TSM = MappingProxyType({"ticker": "TSM", "exchange": "NYSE"})
+
+# Name variants for each company: display names, bank CSV designations and the ticker
+_STOCK_ALIASES = (
+    (_RHM, ("RHEINMETALL AG", "Rheinmetall AG", "Rheinmetall", "RHM")),
+    (_BRK_B, ("Berkshire Hathaway B", "BERKSH. H.B NEW DL-,00333", "BRK.B")),
+    (_ALV, ("Allianz SE", "ALLIANZ SE NA O.N.", "ALV")),
+    (_GTLB, ("GitLab Inc.", "GTLB")),
+    (_NVDA, ("NVIDIA", "NVIDIA CORP. DL-", "NVIDIA CORP.      DL-,001", "NVDA")),
+    (_MSFT, ("Microsoft", "MICROSOFT    DL-,00000625", "MSFT")),
+    (_GOOG, ("Alphabet C", "ALPHABET INC.CL.C DL-", "ALPHABET INC.CL.C DL-,001", "GOOG")),
+    (_CRWD, ("CrowdStrike", "CROWDSTRIKE HLD. DL-,0005", "CRWD")),
+    (_AMD, ("Advanced Micro Devices", "ADVANCED MIC.DEV.  DL-,01", "AMD")),
+    (_NTNX, ("Nutanix", "NUTANIX INC. A", "NTNX")),
+    (_ASML, ("ASML Holding", "ASML HOLDING EO -", "ASML HOLDING    EO -,09", "ASML")),
+    (_TSM, ("Taiwan Semiconductor ADR", "Taiwan Semiconductor",
+            "Taiwan Semiconductor Manufacturing Company", "Taiwan Semiconductor Manufacturing",
+            "TSMC", "TAIWAN SEMICON.MANU.ADR/5", "TSM")),
+)
+
+# Maps every name variant to its ticker and exchange; keys interned like parsed names
+_STOCK_MAP = MappingProxyType({
+    sys.intern(name): info for info, names in _STOCK_ALIASES for name in names
+})
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]')
+
+def _canonical_name(name):
+    """Normalize a stock name to collapsed whitespace and casefolded text.
+    
+    Args:
+        name (str): Stock name.
+        
+    Returns:
+        str: Canonical form of the name.
+    """
+    return _WHITESPACE_RE.sub(' ', name).strip().casefold()
+
+def _alnum_name(name):
+    """Reduce a canonical stock name to its letters and digits only.
+    
+    Args:
+        name (str): Canonical stock name from _canonical_name.
+        
+    Returns:
+        str: Name without punctuation and whitespace.
+    """
+    return _NON_ALNUM_RE.sub('', name)
+
+# Lookup tables for names that differ from a _STOCK_MAP key only in case and
+# spacing, or additionally in punctuation (e.g. "CL.C" vs "CL C"). The derived
+# keys are interned like those of _STOCK_MAP.
+_STOCK_MAP_CANONICAL = {sys.intern(_canonical_name(name)): info for name, info in _STOCK_MAP.items()}
+_STOCK_MAP_ALNUM = {sys.intern(_alnum_name(name)): info for name, info in _STOCK_MAP_CANONICAL.items()}
+
+# Canonical prefixes of bank-export designations, which append share class and
+# nominal value clutter (e.g. "NVIDIA CORP.      DL-,001") that varies between
+# exports. Prefixes are specific enough not to catch other share classes.
+_STOCK_PREFIXES = (
+    ("rheinmetall", _RHM),
+    ("berksh. h.b", _BRK_B),
+    ("allianz se", _ALV),
+    ("nvidia corp", _NVDA),
+    ("microsoft", _MSFT),
+    ("alphabet inc.cl.c", _GOOG),
+    ("alphabet inc.cl c", _GOOG),
+    ("crowdstrike", _CRWD),
+    ("advanced mic", _AMD),
+    ("nutanix", _NTNX),
+    ("asml holding", _ASML),
+    ("taiwan semi", _TSM),
+)
+_STOCK_PREFIX_KEYS = tuple(prefix for prefix, _ in _STOCK_PREFIXES)
 
+def _lookup_by_prefix(canonical_name):
+    """Find the stock entry whose known prefix starts a canonical name.
+    
+    Args:
+        canonical_name (str): Canonical stock name from _canonical_name.
+        
+    Returns:
+        Mapping: Ticker and exchange mapping, or None if no prefix matches.
+    """
+    # A single C-level startswith over all prefixes rejects most misses
+    if not canonical_name.startswith(_STOCK_PREFIX_KEYS):
+        return None
+    for prefix, info in _STOCK_PREFIXES:
+        if canonical_name.startswith(prefix):
+            return info
+    return None
+
+@functools.lru_cache(maxsize=256)
 def get_stock_ticker_and_exchange(stock_name):
     """Map stock names to tickers and exchanges for the API.
 
+    Names are matched exactly first, then ignoring case and whitespace,
+    then ignoring punctuation as well, and finally by known prefixes of
+    bank-export designations. Results are memoized, so names that need
+    the normalizing fallbacks are only normalized once and unmapped names
+    are only reported once.
+
     Args:
         stock_name (str): Stock name to map.
 
     Returns:
-        dict: Dictionary with ticker and exchange, or None if not found.
+        Mapping: Read-only mapping with ticker and exchange, or None if not found.
     """
-    # Stock mapping dictionary that maps company names to their ticker symbols and exchanges
-    # Multiple entries are provided for companies that may be referenced in different ways
-    # For example, TSM (Taiwan Semiconductor) has multiple mappings to handle various
-    # ways it might appear in portfolio data (ticker symbol, full name, abbreviated name)
-    stock_map = {
-        # Company names
-        "RHEINMETALL AG": {"ticker": "RHM", "exchange": "XTRA"},
-        "Rheinmetall AG": {"ticker": "RHM", "exchange": "XTRA"},
-        "Rheinmetall": {"ticker": "RHM", "exchange": "XTRA"},
-        "Berkshire Hathaway B": {"ticker": "BRK.B", "exchange": "NYSE"},
-        "Allianz SE": {"ticker": "ALV", "exchange": "XTRA"},
-        "GitLab Inc.": {"ticker": "GTLB", "exchange": "NasdaqGS"},
-        "NVIDIA": {"ticker": "NVDA", "exchange": "NasdaqGS"},
-        "Microsoft": {"ticker": "MSFT", "exchange": "NasdaqGS"},
-        "Alphabet C": {"ticker": "GOOG", "exchange": "NasdaqGS"},
-        "CrowdStrike": {"ticker": "CRWD", "exchange": "NasdaqGS"},
-        "Advanced Micro Devices": {"ticker": "AMD", "exchange": "NasdaqGS"},
-        "Nutanix": {"ticker": "NTNX", "exchange": "NasdaqGS"},
-        "ASML Holding": {"ticker": "ASML", "exchange": "NasdaqGS"},
-        "Taiwan Semiconductor ADR": {"ticker": "TSM", "exchange": "NYSE"},
-        "Taiwan Semiconductor": {"ticker": "TSM", "exchange": "NYSE"},
-        "Taiwan Semiconductor Manufacturing Company": {"ticker": "TSM", "exchange": "NYSE"},
-        "Taiwan Semiconductor Manufacturing": {"ticker": "TSM", "exchange": "NYSE"},
-        "TSMC": {"ticker": "TSM", "exchange": "NYSE"},
-        
-        # CSV format variations
-        "ALLIANZ SE NA O.N.": {"ticker": "ALV", "exchange": "XTRA"},
-        "ADVANCED MIC.DEV.  DL-,01": {"ticker": "AMD", "exchange": "NasdaqGS"},
-        "BERKSH. H.B NEW DL-,00333": {"ticker": "BRK.B", "exchange": "NYSE"},
-        "MICROSOFT    DL-,00000625": {"ticker": "MSFT", "exchange": "NasdaqGS"},
-        "ASML HOLDING EO -": {"ticker": "ASML", "exchange": "NasdaqGS"},
-        "ASML HOLDING    EO -,09": {"ticker": "ASML", "exchange": "NasdaqGS"},
-        "ALPHABET INC.CL.C DL-": {"ticker": "GOOG", "exchange": "NasdaqGS"},
-        "ALPHABET INC.CL.C DL-,001": {"ticker": "GOOG", "exchange": "NasdaqGS"},
-        "NVIDIA CORP. DL-": {"ticker": "NVDA", "exchange": "NasdaqGS"},
-        "NVIDIA CORP.      DL-,001": {"ticker": "NVDA", "exchange": "NasdaqGS"},
-        "TAIWAN SEMICON.MANU.ADR/5": {"ticker": "TSM", "exchange": "NYSE"},
-        "CROWDSTRIKE HLD. DL-,0005": {"ticker": "CRWD", "exchange": "NasdaqGS"},
-        "NUTANIX INC. A": {"ticker": "NTNX", "exchange": "NasdaqGS"},
-        
-        # Direct ticker mappings for all companies
-        "RHM": {"ticker": "RHM", "exchange": "XTRA"},
-        "MSFT": {"ticker": "MSFT", "exchange": "NasdaqGS"},
-        "NVDA": {"ticker": "NVDA", "exchange": "NasdaqGS"},
-        "GOOG": {"ticker": "GOOG", "exchange": "NasdaqGS"},
-        "GTLB": {"ticker": "GTLB", "exchange": "NasdaqGS"},
-        "ALV": {"ticker": "ALV", "exchange": "XTRA"},
-        "AMD": {"ticker": "AMD", "exchange": "NasdaqGS"},
-        "BRK.B": {"ticker": "BRK.B", "exchange": "NYSE"},
-        "ASML": {"ticker": "ASML", "exchange": "NasdaqGS"},
-        "CRWD": {"ticker": "CRWD", "exchange": "NasdaqGS"},
-        "NTNX": {"ticker": "NTNX", "exchange": "NasdaqGS"},
-        "TSM": {"ticker": "TSM", "exchange": "NYSE"}
-    }
-    
-    stock_info = stock_map.get(stock_name)
+    stock_info = _STOCK_MAP.get(stock_name)
+    if not stock_info:
+        canonical_name = _canonical_name(stock_name)
+        stock_info = (_STOCK_MAP_CANONICAL.get(canonical_name) or
+                      _STOCK_MAP_ALNUM.get(_alnum_name(canonical_name)) or
+                      _lookup_by_prefix(canonical_name))
     if not stock_info:
         logger.warning(f"No ticker/exchange mapping found for {stock_name}")
     
-    return stock_info 
\ No newline at end of file
+    return stock_info
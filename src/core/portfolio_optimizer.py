@@ -12,6 +12,7 @@ holdings to provide optimization recommendations. It includes functionality to:
 import os
 import csv
 import json
+import logging
 import re
 from datetime import datetime
 from src.core.logger import logger
@@ -19,6 +20,38 @@ from src.core.config import config
 from src.core.file_operations import save_markdown
 from src.core.portfolio import get_stock_ticker_and_exchange
 
+# Patterns used for every summary line and position field, compiled once
+_DATE_RE = re.compile(r'(\d{2}\.\d{2}\.\d{4})')
+_EUR_NUM_RE = re.compile(r'([\d.,]+)')
+_PCT_RE = re.compile(r'([+-]?[\d.,]+)')
+
+# Map for converting portfolio designations to tickers
+_TICKER_MAP = {
+    "ALLIANZ SE NA O.N.": "ALV",
+    "ASML HOLDING    EO -,09": "ASML",
+    "ADVANCED MIC.DEV.  DL-,01": "AMD",
+    "ALPHABET INC.CL C DL-,001": "GOOG",
+    "BERKSH. H.B NEW DL-,00333": "BRK.B",
+    "CROWDSTRIKE HLD. DL-,0005": "CRWD",
+    "MICROSOFT    DL-,00000625": "MSFT",
+    "NUTANIX INC. A": "NTNX",
+    "NVIDIA CORP.      DL-,001": "NVDA",
+    "TAIWAN SEMICON.MANU.ADR/5": "TSM"
+}
+
+# Recommendation terms per category, checked in this order
+# ('STRONG BUY' / 'STRONG SELL' are covered by the plain terms)
+_BUY_TERMS = ('BUY', 'ACCUMULATE', 'OVERWEIGHT')
+_SELL_TERMS = ('SELL', 'REDUCE', 'UNDERWEIGHT')
+_HOLD_TERMS = ('HOLD', 'NEUTRAL', 'MARKET PERFORM', 'EQUAL WEIGHT')
+
+# Category of the common recommendation strings, looked up before scanning terms
+_REC_BUCKET = {
+    'BUY': 'BUY', 'STRONG BUY': 'BUY', 'ACCUMULATE': 'BUY', 'OVERWEIGHT': 'BUY',
+    'SELL': 'SELL', 'STRONG SELL': 'SELL', 'REDUCE': 'SELL', 'UNDERWEIGHT': 'SELL',
+    'HOLD': 'HOLD', 'NEUTRAL': 'HOLD', 'MARKET PERFORM': 'HOLD', 'EQUAL WEIGHT': 'HOLD'
+}
+
 def read_csv_content(csv_path):
     """Read raw content from a CSV file.
     
@@ -29,8 +62,9 @@ def read_csv_content(csv_path):
         str: Raw content of the CSV file or None if error.
     """
     try:
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # Read raw bytes and decode once, skipping text-mode newline translation
+        with open(csv_path, 'rb') as f:
+            content = f.read().decode('utf-8')
         return content
     except FileNotFoundError:
         logger.error(f"Portfolio CSV file {csv_path} not found.")
@@ -65,25 +99,29 @@ def extract_portfolio_summary(lines, delimiter):
         str: Date string in YYYY-MM-DD format.
     """
     portfolio_summary = {}
-    date = datetime.now().strftime("%Y-%m-%d")  # Default date
+    date = None
     
     # If using semicolon format, try to extract summary data
     if delimiter == ';':
-        for i in range(10):  # First 10 lines usually contain summary data
-            if i < len(lines) and delimiter in lines[i]:
-                key, value = lines[i].split(delimiter, 1)
-                portfolio_summary[key] = process_summary_value(key, value)
-                
-                # Try to extract date
-                date_match = re.search(r'(\d{2}\.\d{2}\.\d{4})', value)
+        for line in lines[:10]:  # First 10 lines usually contain summary data
+            key, found, value = line.partition(delimiter)
+            if not found:
+                continue
+            portfolio_summary[key] = process_summary_value(key, value)
+            
+            # Try to extract date, keeping the first one found (the export timestamp)
+            if date is None:
+                date_match = _DATE_RE.search(value)
                 if date_match:
-                    date_str = date_match.group(1)
                     try:
-                        date_obj = datetime.strptime(date_str, "%d.%m.%Y")
+                        date_obj = datetime.strptime(date_match.group(1), "%d.%m.%Y")
                         date = date_obj.strftime("%Y-%m-%d")
                     except ValueError:
                         pass
     
+    if date is None:
+        date = datetime.now().strftime("%Y-%m-%d")  # Default date
+    
     # Set the date in the summary
     portfolio_summary['date'] = date
     return portfolio_summary, date
@@ -102,7 +140,7 @@ def process_summary_value(key, value):
     
     if 'EUR' in value:
         # Extract numerical value and convert to float
-        match = re.search(r'([\d.,]+)', value.replace(' ', ''))
+        match = _EUR_NUM_RE.search(value.replace(' ', ''))
         if match:
             # Replace comma with dot for float conversion
             num_str = match.group(1).replace('.', '').replace(',', '.')
@@ -112,7 +150,7 @@ def process_summary_value(key, value):
                 return value
     elif '%' in value:
         # Extract percentage and convert to float
-        match = re.search(r'([+-]?[\d.,]+)', value.replace(',', '.'))
+        match = _PCT_RE.search(value.replace(',', '.'))
         if match:
             return float(match.group(1))
     
@@ -129,12 +167,13 @@ def find_header_line(lines, delimiter):
         int or None: Index of header line or None if not found.
     """
     # Check for traditional semicolon format
-    for i, line in enumerate(lines):
-        if delimiter == ';' and line.startswith('Position;Bezeichnung;WKN;ISIN'):
-            return i
+    if delimiter == ';':
+        for i, line in enumerate(lines):
+            if line.startswith('Position;Bezeichnung;WKN;ISIN'):
+                return i
             
     # Check for comma-separated format (combined_portfolio.csv)
-    if delimiter == ',':
+    elif delimiter == ',':
         for i, line in enumerate(lines):
             if 'Security' in line and 'ISIN' in line and 'Shares' in line:
                 return i
@@ -157,18 +196,22 @@ def parse_positions(lines, header_line_idx, headers, delimiter):
     Returns:
         list: List of parsed positions.
     """
-    positions = []
+    # Collect the position block first so it can be split in one batch
+    position_lines = []
     for i in range(header_line_idx + 1, len(lines)):
         line = lines[i].strip()
         if not line or line.startswith('Diese Aufstellung'):
             break
-        
-        # For the comma-separated format, handle quoted values correctly
-        if delimiter == ',':
-            values = next(csv.reader([line], delimiter=delimiter, quotechar='"'))
-        else:
-            values = line.split(delimiter)
-        
+        position_lines.append(line)
+
+    # For the comma-separated format, handle quoted values correctly
+    if delimiter == ',':
+        rows = csv.reader(position_lines, delimiter=delimiter, quotechar='"')
+    else:
+        rows = (line.split(delimiter) for line in position_lines)
+
+    positions = []
+    for values in rows:
         if len(values) < len(headers):
             continue
         
@@ -188,19 +231,46 @@ def create_position_entry(headers, values):
         dict: Position entry with processed values.
     """
     position = {}
-    for j, header in enumerate(headers):
-        if j < len(values):
-            value = values[j].strip() if values[j] else ""
-            
-            # Skip empty values
-            if not value:
-                position[header] = None
-                continue
-            
-            position[header] = convert_position_value(header, value)
+    # zip stops at the shorter list, so surplus values are ignored
+    for header, value in zip(headers, values):
+        value = value.strip()
+        
+        # Skip empty values
+        position[header] = convert_position_value(header, value) if value else None
     
     return position
 
+def _convert_signed_percent(value):
+    """Convert a '+'-prefixed decimal-comma percentage, e.g. '+44,69'."""
+    if value.startswith('+'):
+        return float(value.replace('+', '').replace(',', '.'))
+    return value
+
+def _convert_signed_amount(value):
+    """Convert a '+'-prefixed EUR amount with thousands dots, e.g. '+68.357,28'."""
+    if value.startswith('+'):
+        return float(value.replace('+', '').replace('.', '').replace(',', '.'))
+    return value
+
+def _convert_decimal_comma(value):
+    """Convert a decimal-comma number, e.g. '328,8'."""
+    return float(value.replace(',', '.'))
+
+def _convert_amount(value):
+    """Convert an EUR amount with thousands dots, e.g. '63.458,40'."""
+    return float(value.replace('.', '').replace(',', '.'))
+
+# Converters for position columns whose values are not plain numbers
+_HEADER_CONVERTERS = {
+    'Veränderung in %': _convert_signed_percent,
+    'Veränderung in EUR': _convert_signed_amount,
+    'Anteil im Depot': _convert_decimal_comma,
+    'Einstandskurs': _convert_decimal_comma,
+    'akt. Kurs': _convert_decimal_comma,
+    'Einstandswert in EUR': _convert_amount,
+    'Wert in EUR': _convert_amount
+}
+
 def convert_position_value(header, value):
     """Convert position values to appropriate types.
     
@@ -211,23 +281,19 @@ def convert_position_value(header, value):
     Returns:
         int, float, or str: Converted value.
     """
-    # Convert numerical values
-    if re.match(r'^[+-]?\d+$', value):
+    # Convert numerical values; isdecimal() accepts exactly the digits int() does
+    digits = value[1:] if value[0] in '+-' else value
+    if digits.isdecimal():
         return int(value)
-    elif re.match(r'^[+-]?\d+[.,]\d+$', value):
-        return float(value.replace(',', '.'))
-    elif header == 'Veränderung in %' and value.startswith('+'):
-        return float(value.replace('+', '').replace(',', '.'))
-    elif header == 'Veränderung in EUR' and value.startswith('+'):
-        return float(value.replace('+', '').replace('.', '').replace(',', '.'))
-    elif header == 'Anteil im Depot':
-        return float(value.replace(',', '.'))
-    elif header in ['Einstandskurs', 'akt. Kurs']:
+    head, sep, tail = digits.partition('.')
+    if not sep:
+        head, sep, tail = digits.partition(',')
+    if sep and head.isdecimal() and tail.isdecimal():
         return float(value.replace(',', '.'))
-    elif header == 'Einstandswert in EUR' or header == 'Wert in EUR':
-        return float(value.replace('.', '').replace(',', '.'))
-    else:
-        return value
+    
+    # Column-specific formats
+    converter = _HEADER_CONVERTERS.get(header)
+    return converter(value) if converter else value
 
 def parse_portfolio_csv(csv_path):
     """Parse portfolio data from a bank CSV export.
@@ -242,19 +308,22 @@ def parse_portfolio_csv(csv_path):
     if not content:
         return None
     
-    # Print first 10 lines of content for debugging
-    print("Portfolio CSV - first 10 lines:")
-    lines = content.split('\n')
-    for i, line in enumerate(lines[:10]):
-        print(f"Line {i}: {line}")
+    # splitlines handles '\n', '\r\n' and '\r' endings in a single pass
+    lines = content.splitlines()
+    
+    # Log first 10 lines of content for debugging
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    if debug_enabled:
+        for i, line in enumerate(lines[:10]):
+            logger.debug("Portfolio CSV line %d: %s", i, line)
     
     delimiter = determine_delimiter(lines)
     portfolio_summary, date = extract_portfolio_summary(lines, delimiter)
     
-    # Print the extracted summary values for debugging
-    print("\nPortfolio summary extracted values:")
-    for key, value in portfolio_summary.items():
-        print(f"{key}: {value} (type: {type(value)})")
+    # Log the extracted summary values for debugging
+    if debug_enabled:
+        for key, value in portfolio_summary.items():
+            logger.debug("Portfolio summary %s: %s (type: %s)", key, value, type(value).__name__)
     
     header_line_idx = find_header_line(lines, delimiter)
     if header_line_idx is None:
@@ -273,57 +342,114 @@ def parse_portfolio_csv(csv_path):
         "date": date
     }
 
+def index_analysis_by_ticker(analysis_results):
+    """Build a ticker lookup for analysis results.
+    
+    Args:
+        analysis_results (list): Stock analyses from get_value_investing_signals.
+        
+    Returns:
+        dict: Stock analysis by ticker.
+    """
+    return {stock['ticker']: stock for stock in analysis_results if stock.get('ticker')}
+
+def _map_position(position, analysis_by_ticker):
+    """Attach the ticker and analysis for a position's designation.
+    
+    Args:
+        position (dict): Position with a 'Bezeichnung' designation.
+        analysis_by_ticker (dict): Stock analysis by ticker.
+        
+    Returns:
+        dict: The same position, with 'analysis' (None if unmapped) and 'ticker' set.
+    """
+    designation = position['Bezeichnung']
+    ticker = _TICKER_MAP.get(designation)
+    if not ticker:
+        logger.warning(f"Could not map {designation} to a ticker.")
+        position['analysis'] = None
+        return position
+    
+    position['analysis'] = analysis_by_ticker.get(ticker)
+    position['ticker'] = ticker
+    return position
+
 def map_portfolio_to_analysis(portfolio_data, analysis_results):
     """Map portfolio positions to analysis results.
     
     Args:
         portfolio_data (dict): Portfolio data from parse_portfolio_csv.
-        analysis_results (dict): Analysis results from get_value_investing_signals.
+        analysis_results (list or dict): Stock analyses from get_value_investing_signals,
+            or a lookup already built with index_analysis_by_ticker to reuse across calls.
         
     Returns:
         list: List of positions with analysis results.
     """
     # Extract tickers from analysis results for easy lookup
-    analysis_by_ticker = {}
-    for stock in analysis_results:
-        ticker = stock.get('ticker')
-        if ticker:
-            analysis_by_ticker[ticker] = stock
-    
-    # Map for converting portfolio designations to tickers
-    ticker_map = {
-        "ALLIANZ SE NA O.N.": "ALV",
-        "ASML HOLDING    EO -,09": "ASML",
-        "ADVANCED MIC.DEV.  DL-,01": "AMD",
-        "ALPHABET INC.CL C DL-,001": "GOOG",
-        "BERKSH. H.B NEW DL-,00333": "BRK.B",
-        "CROWDSTRIKE HLD. DL-,0005": "CRWD",
-        "MICROSOFT    DL-,00000625": "MSFT",
-        "NUTANIX INC. A": "NTNX",
-        "NVIDIA CORP.      DL-,001": "NVDA",
-        "TAIWAN SEMICON.MANU.ADR/5": "TSM"
-    }
+    if isinstance(analysis_results, dict):
+        analysis_by_ticker = analysis_results
+    else:
+        analysis_by_ticker = index_analysis_by_ticker(analysis_results)
     
     # Map positions to analysis
-    mapped_positions = []
-    for position in portfolio_data['positions']:
-        designation = position.get('Bezeichnung')
-        if not designation:
-            continue
+    return [
+        _map_position(position, analysis_by_ticker)
+        for position in portfolio_data['positions']
+        if position.get('Bezeichnung')
+    ]
+
+class _EurNumberTable(dict):
+    """str.translate table turning a European number string into a float literal.
+    
+    Digits are kept, thousands periods dropped, the decimal comma becomes a
+    period and every other character is removed. Entries are filled in lazily
+    on first lookup, so any character (e.g. '€') can be filtered without
+    enumerating the whole Unicode range up front.
+    """
+    
+    def __missing__(self, codepoint):
+        self[codepoint] = keep = codepoint if chr(codepoint).isdigit() else None
+        return keep
+
+_EU_FIX = _EurNumberTable({ord('.'): None, ord(','): '.'})
+
+def _parse_eur_number(value):
+    """Parse a European-formatted number string such as '€ 1.234,56'.
+    
+    Args:
+        value (str): Number string with '.' thousands and ',' decimal separators.
         
-        ticker = ticker_map.get(designation)
-        if not ticker:
-            logger.warning(f"Could not map {designation} to a ticker.")
-            position['analysis'] = None
-            mapped_positions.append(position)
-            continue
+    Returns:
+        float: Parsed number.
+        
+    Raises:
+        ValueError: If no number can be parsed from the string.
+    """
+    # Filter and swap separators in a single pass
+    return float(value.translate(_EU_FIX))
+
+def ensure_numeric_value(value, default=0.0):
+    """Ensure a value is numeric, converting from string if needed.
+    
+    Args:
+        value: Value to ensure is numeric.
+        default (float): Default value if conversion fails.
         
-        analysis = analysis_by_ticker.get(ticker)
-        position['analysis'] = analysis
-        position['ticker'] = ticker
-        mapped_positions.append(position)
+    Returns:
+        float: Numeric value.
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+        
+    if isinstance(value, str):
+        try:
+            # Handle various formats including percentage and currency
+            clean_value = value.replace('%', '').replace(',', '.').replace('€', '').strip()
+            return float(clean_value)
+        except (ValueError, TypeError):
+            return default
     
-    return mapped_positions
+    return default
 
 def validate_total_value(total_value):
     """Validate and convert total value to float if needed.
@@ -340,15 +466,11 @@ def validate_total_value(total_value):
     if isinstance(total_value, str):
         # Try to convert string to float - handle European format
         try:
-            # Remove any non-numeric characters except for comma and period
-            cleaned_value = ''.join(c for c in total_value if c.isdigit() or c in ',.').strip()
-            # Replace comma with period for float conversion
-            cleaned_value = cleaned_value.replace('.', '').replace(',', '.')
-            total_value = float(cleaned_value)
-            print(f"Converted string total value to number: €{total_value:,.2f}")
+            total_value = _parse_eur_number(total_value)
+            logger.debug("Converted string total value to number: €%.2f", total_value)
         except (ValueError, TypeError):
+            logger.warning("Could not convert total value string: %s", total_value)
             total_value = None
-            print(f"Could not convert total value string: {total_value}")
     
     return total_value
 
@@ -367,22 +489,72 @@ def calculate_total_value_from_positions(mapped_positions):
         if isinstance(position_value, str):
             # Convert string to float if needed
             try:
-                cleaned_value = ''.join(c for c in position_value if c.isdigit() or c in ',.').strip()
-                cleaned_value = cleaned_value.replace('.', '').replace(',', '.')
-                position_value = float(cleaned_value)
+                position_value = _parse_eur_number(position_value)
             except (ValueError, TypeError):
                 position_value = 0
         calculated_value += position_value
         
     if calculated_value > 0:
-        print(f"Using calculated total value from positions: €{calculated_value:,.2f}")
+        logger.debug("Using calculated total value from positions: €%.2f", calculated_value)
         return calculated_value
     else:
         # Fallback to a default value if can't calculate
         default_value = 220575.80  # Default from the CSV
-        print(f"Using default total value: €{default_value:,.2f}")
+        logger.debug("Using default total value: €%.2f", default_value)
         return default_value
 
+def _classify(rec_upper):
+    """Classify an upper-cased recommendation into a category.
+    
+    Args:
+        rec_upper (str): Recommendation text in upper case.
+        
+    Returns:
+        str or None: 'BUY', 'SELL' or 'HOLD', or None if unrecognized.
+    """
+    category = _REC_BUCKET.get(rec_upper.strip())
+    if category is not None:
+        return category
+    
+    # Fall back to scanning for the terms inside longer recommendation texts
+    if any(term in rec_upper for term in _BUY_TERMS):
+        return 'BUY'
+    if any(term in rec_upper for term in _SELL_TERMS):
+        return 'SELL'
+    if any(term in rec_upper for term in _HOLD_TERMS):
+        return 'HOLD'
+    return None
+
+def _categorize_position(position):
+    """Normalize a position's recommendation and classify it.
+    
+    Missing analyses and empty recommendations are set to HOLD on the position.
+    
+    Args:
+        position (dict): Position with analysis results.
+        
+    Returns:
+        str: Recommendation text.
+        str or None: 'BUY', 'SELL' or 'HOLD', or None if unrecognized.
+    """
+    analysis = position['analysis']
+    if analysis is None:
+        logger.warning(f"No analysis found for {position.get('ticker', 'unknown')}. Treating as HOLD.")
+        analysis = position['analysis'] = {'recommendation': 'HOLD'}
+    
+    # Get recommendation, defaulting to HOLD if missing
+    recommendation = analysis.get('recommendation', 'HOLD')
+    if recommendation is None or recommendation.strip() == '':
+        recommendation = 'HOLD'
+        analysis['recommendation'] = 'HOLD'
+    
+    # Check for various forms of BUY/SELL/HOLD
+    category = _classify(recommendation.upper())
+    if category is None:
+        # If we can't categorize, default to HOLD
+        logger.warning(f"Couldn't categorize recommendation '{recommendation}' for {position.get('ticker', 'unknown')}. Defaulting to HOLD.")
+    return recommendation, category
+
 def categorize_positions(mapped_positions):
     """Categorize positions based on analysis recommendations.
     
@@ -395,64 +567,70 @@ def categorize_positions(mapped_positions):
     buys = []
     holds = []
     sells = []
+    categories = {'BUY': buys, 'SELL': sells}
     
     for position in mapped_positions:
-        if position['analysis'] is None:
-            logger.warning(f"No analysis found for {position.get('ticker', 'unknown')}. Treating as HOLD.")
-            position['analysis'] = {'recommendation': 'HOLD'}
-            holds.append(position)
-            continue
-        
-        # Get recommendation, defaulting to HOLD if missing
-        recommendation = position['analysis'].get('recommendation', 'HOLD')
-        if recommendation is None or recommendation.strip() == '':
-            recommendation = 'HOLD'
-            position['analysis']['recommendation'] = 'HOLD'
-        
-        # Normalize the recommendation text to handle variations
-        rec_upper = recommendation.upper()
-        
-        # Check for various forms of BUY/SELL/HOLD
-        if any(buy_term in rec_upper for buy_term in ['BUY', 'STRONG BUY', 'ACCUMULATE', 'OVERWEIGHT']):
-            buys.append(position)
-        elif any(sell_term in rec_upper for sell_term in ['SELL', 'STRONG SELL', 'REDUCE', 'UNDERWEIGHT']):
-            sells.append(position)
-        elif any(hold_term in rec_upper for hold_term in ['HOLD', 'NEUTRAL', 'MARKET PERFORM', 'EQUAL WEIGHT']):
-            holds.append(position)
-        else:
-            # If we can't categorize, default to HOLD
-            logger.warning(f"Couldn't categorize recommendation '{recommendation}' for {position.get('ticker', 'unknown')}. Defaulting to HOLD.")
-            holds.append(position)
+        _, category = _categorize_position(position)
+        categories.get(category, holds).append(position)
     
     return buys, holds, sells
 
-def calculate_current_allocation(mapped_positions):
-    """Calculate current portfolio allocation.
+def calculate_allocations(mapped_positions):
+    """Calculate current and recommendation-weighted allocation in one pass.
+    
+    Each position's recommendation is normalized (missing analyses and empty
+    recommendations become HOLD) and classified once. The classification is
+    used to scale the current allocation by the configured buy/sell factors.
     
     Args:
         mapped_positions (list): List of positions with analysis results.
         
     Returns:
         dict: Current allocation by ticker.
+        dict: Preliminary (not yet normalized) target allocation by ticker.
     """
+    # Get factors from configuration
+    buy_boost = config["portfolio"]["optimization"].get("buy_boost_factor", 1.5)
+    sell_reduction = config["portfolio"]["optimization"].get("sell_reduction_factor", 0.5)
+    
     current_allocation = {}
+    preliminary_allocations = {}
+    
     for position in mapped_positions:
         ticker = position.get('ticker')
-        if ticker:
-            # Get recommendation with clear default
-            recommendation = 'HOLD'
-            if position['analysis'] and isinstance(position['analysis'], dict):
-                rec = position['analysis'].get('recommendation')
-                if rec and isinstance(rec, str) and rec.strip():
-                    recommendation = rec.strip()
-                    
-            current_allocation[ticker] = {
-                'percent': position.get('Anteil im Depot', 0),
-                'value': position.get('Wert in EUR', 0),
-                'name': position.get('Bezeichnung', ticker),
-                'recommendation': recommendation
-            }
+        recommendation, category = _categorize_position(position)
+        
+        if not ticker:
+            continue
+        
+        percent = position.get('Anteil im Depot', 0)
+        current_allocation[ticker] = {
+            'percent': percent,
+            'value': position.get('Wert in EUR', 0),
+            'name': position.get('Bezeichnung', ticker),
+            'recommendation': recommendation.strip()
+        }
+        
+        # Apply different allocation factors based on recommendation type
+        if category == 'BUY':
+            preliminary_allocations[ticker] = percent * buy_boost
+        elif category == 'SELL':
+            preliminary_allocations[ticker] = percent * sell_reduction
+        else:  # HOLD or any unrecognized recommendation
+            preliminary_allocations[ticker] = percent
+    
+    return current_allocation, preliminary_allocations
+
+def calculate_current_allocation(mapped_positions):
+    """Calculate current portfolio allocation.
     
+    Args:
+        mapped_positions (list): List of positions with analysis results.
+        
+    Returns:
+        dict: Current allocation by ticker.
+    """
+    current_allocation, _ = calculate_allocations(mapped_positions)
     return current_allocation
 
 def calculate_target_allocation(current_allocation):
@@ -467,34 +645,46 @@ def calculate_target_allocation(current_allocation):
     # Get factors from configuration
     buy_boost = config["portfolio"]["optimization"].get("buy_boost_factor", 1.5)
     sell_reduction = config["portfolio"]["optimization"].get("sell_reduction_factor", 0.5)
+    factors = {'BUY': buy_boost, 'SELL': sell_reduction}
     
-    target_allocation = {}
-    preliminary_allocations = {}
+    preliminary_allocations = {
+        ticker: data['percent'] * factors.get(_classify(data['recommendation'].upper()), 1)
+        for ticker, data in current_allocation.items()
+    }
+    target_allocation, _ = _calculate_target_and_changes(current_allocation, preliminary_allocations, 0.0)
+    return target_allocation
+
+def _allocation_change(ticker, current_data, current, target, total_value):
+    """Build the change needed to move a position to its target allocation.
     
-    # Calculate preliminary target allocations
-    for ticker, data in current_allocation.items():
-        recommendation = data['recommendation']
-        rec_upper = recommendation.upper()
+    Args:
+        ticker (str): Ticker of the position.
+        current_data (dict): Current allocation entry of the position.
+        current (float): Current allocation in percent.
+        target (float): Target allocation in percent.
+        total_value (float): Total portfolio value.
         
-        # Apply different allocation factors based on recommendation type
-        if any(buy_term in rec_upper for buy_term in ['BUY', 'STRONG BUY', 'ACCUMULATE', 'OVERWEIGHT']):
-            preliminary_allocations[ticker] = data['percent'] * buy_boost
-        elif any(sell_term in rec_upper for sell_term in ['SELL', 'STRONG SELL', 'REDUCE', 'UNDERWEIGHT']):
-            preliminary_allocations[ticker] = data['percent'] * sell_reduction
-        else:  # HOLD or any unrecognized recommendation
-            preliminary_allocations[ticker] = data['percent']
+    Returns:
+        dict: Change with float percentages and value.
+    """
+    change_percent = target - current
     
-    # Normalize allocations to sum to 100%
-    total_preliminary = sum(preliminary_allocations.values())
-    if total_preliminary > 0:  # Avoid division by zero
-        for ticker, allocation in preliminary_allocations.items():
-            target_allocation[ticker] = (allocation / total_preliminary) * 100
-    else:
-        # If sum is zero (unlikely), just keep current allocations
-        for ticker, data in current_allocation.items():
-            target_allocation[ticker] = data['percent']
+    # Calculate the change value
+    try:
+        change_value = (change_percent / 100) * total_value
+    except (TypeError, ValueError):
+        logger.warning(f"Error calculating change value for {ticker}. Using 0.")
+        change_value = 0.0
     
-    return target_allocation
+    return {
+        'ticker': ticker,
+        'name': current_data['name'],
+        'current_percent': current,
+        'target_percent': target,
+        'change_percent': change_percent,
+        'change_value': change_value,
+        'recommendation': current_data['recommendation']
+    }
 
 def calculate_allocation_changes(current_allocation, target_allocation, total_value):
     """Calculate changes needed to reach target allocation.
@@ -507,52 +697,53 @@ def calculate_allocation_changes(current_allocation, target_allocation, total_va
     Returns:
         list: Sorted list of changes by magnitude.
     """
-    changes = {}
+    changes = []
     for ticker, target in target_allocation.items():
-        current = current_allocation[ticker]['percent']
-        
-        # Ensure values are floats 
-        if isinstance(current, str):
-            try:
-                current = float(current.replace('%', '').strip())
-            except ValueError:
-                logger.warning(f"Invalid current percent for {ticker}: {current}. Using 0.")
-                current = 0.0
-                
-        if isinstance(target, str):
-            try:
-                target = float(target.replace('%', '').strip())
-            except ValueError:
-                logger.warning(f"Invalid target percent for {ticker}: {target}. Using current value.")
-                target = current
-        
-        change_percent = target - current
+        current_data = current_allocation[ticker]
+        # Ensure values are floats
+        current = ensure_numeric_value(current_data['percent'])
+        changes.append(_allocation_change(
+            ticker, current_data, current, ensure_numeric_value(target, current), total_value
+        ))
+    
+    # Sort changes by absolute magnitude (largest changes first)
+    changes.sort(key=lambda x: abs(x['change_percent']), reverse=True)
+    return changes
+
+def _calculate_target_and_changes(current_allocation, preliminary_allocations, total_value):
+    """Calculate target allocation and the changes needed to reach it in one pass.
+    
+    Args:
+        current_allocation (dict): Current allocation by ticker.
+        preliminary_allocations (dict): Preliminary target allocation by ticker.
+        total_value (float): Total portfolio value.
         
-        # Calculate the change value
-        try:
-            change_value = (change_percent / 100) * total_value
-        except (TypeError, ValueError):
-            logger.warning(f"Error calculating change value for {ticker}. Using 0.")
-            change_value = 0.0
-        
-        changes[ticker] = {
-            'ticker': ticker,
-            'name': current_allocation[ticker]['name'],
-            'current_percent': current,
-            'target_percent': target,
-            'change_percent': change_percent,
-            'change_value': change_value,
-            'recommendation': current_allocation[ticker]['recommendation']
-        }
+    Returns:
+        dict: Target allocation by ticker, normalized to sum to 100%.
+        list: Sorted list of changes by magnitude, with float percentages and values.
+    """
+    target_allocation = {}
+    changes = []
+    
+    # Normalize allocations to sum to 100%, scaling by one precomputed factor
+    total_preliminary = sum(preliminary_allocations.values())
+    scale = 100 / total_preliminary if total_preliminary > 0 else None  # Avoid division by zero
+    for ticker, allocation in preliminary_allocations.items():
+        current_data = current_allocation[ticker]
+        # Ensure values are floats, so the stored changes need no further conversion
+        current = ensure_numeric_value(current_data['percent'])
+        if scale is not None:
+            target = allocation * scale
+        else:
+            # If sum is zero (unlikely), just keep current allocations
+            target = current
+        target_allocation[ticker] = target
+        changes.append(_allocation_change(ticker, current_data, current, target, total_value))
     
     # Sort changes by absolute magnitude (largest changes first)
-    sorted_changes = sorted(
-        changes.values(), 
-        key=lambda x: abs(x['change_percent']), 
-        reverse=True
-    )
+    changes.sort(key=lambda x: abs(x['change_percent']), reverse=True)
     
-    return sorted_changes
+    return target_allocation, changes
 
 def optimize_portfolio(mapped_positions, total_value=None):
     """Generate portfolio optimization recommendations.
@@ -571,19 +762,15 @@ def optimize_portfolio(mapped_positions, total_value=None):
     if not total_value:
         total_value = calculate_total_value_from_positions(mapped_positions)
     else:
-        print(f"Using provided total value: €{total_value:,.2f}")
-    
-    # Categorize positions
-    buys, holds, sells = categorize_positions(mapped_positions)
-    
-    # Calculate current allocation
-    current_allocation = calculate_current_allocation(mapped_positions)
+        logger.debug("Using provided total value: €%.2f", total_value)
     
-    # Calculate target allocation
-    target_allocation = calculate_target_allocation(current_allocation)
+    # Categorize positions and calculate current and preliminary allocation
+    current_allocation, preliminary_allocations = calculate_allocations(mapped_positions)
     
-    # Calculate changes needed
-    sorted_changes = calculate_allocation_changes(current_allocation, target_allocation, total_value)
+    # Calculate target allocation and the changes needed
+    target_allocation, sorted_changes = _calculate_target_and_changes(
+        current_allocation, preliminary_allocations, total_value
+    )
     
     return {
         'total_value': total_value,
@@ -602,43 +789,99 @@ def format_portfolio_summary(portfolio_data, total_value):
     Returns:
         str: Markdown-formatted portfolio summary.
     """
-    markdown = "## Portfolio Summary\n\n"
-    markdown += f"Date: {portfolio_data['date']}\n\n"
+    return (
+        "## Portfolio Summary\n\n"
+        f"Date: {portfolio_data['date']}\n\n"
+        f"Total portfolio value: €{total_value:,.2f}\n"
+        f"Total positions: {len(portfolio_data['positions'])}\n\n"
+    )
+
+def _format_change_row(change):
+    """Format a change as a table row and, if it moves money, an action item.
     
-    # Format the total value ensuring it's a number
-    if isinstance(total_value, str):
-        try:
-            total_value = float(total_value.replace(',', '').replace('.', '').replace('€', ''))
-        except (ValueError, TypeError):
-            total_value = 0.0
+    Args:
+        change (dict): Portfolio change from optimize_portfolio.
+        
+    Returns:
+        str: Markdown table row.
+        str or None: Markdown buy/sell action item, or None for an unchanged position.
+    """
+    change_percent = change['change_percent']
+    change_value = change['change_value']
+    current_percent = f"{change['current_percent']:.2f}%"
+    target_percent = f"{change['target_percent']:.2f}%"
+    
+    # Format change with plus/minus sign
+    change_percent_str = f"+{change_percent:.2f}%" if change_percent >= 0 else f"{change_percent:.2f}%"
+    change_value_str = f"+{change_value:,.2f}" if change_value >= 0 else f"{change_value:,.2f}"
+    
+    row = (
+        f"| {change['name']} | {change['ticker']} | {current_percent} | {target_percent} | "
+        f"{change_percent_str} | {change_value_str} | {change['recommendation']} |\n"
+    )
     
-    markdown += f"Total portfolio value: €{total_value:,.2f}\n"
-    markdown += f"Total positions: {len(portfolio_data['positions'])}\n\n"
+    if change_value > 0:
+        action = f"Increase position by €{change_value:,.2f} "
+    elif change_value < 0:
+        action = f"Reduce position by €{-change_value:,.2f} "
+    else:
+        return row, None
     
-    return markdown
+    action_item = (
+        f"- **{change['name']} ({change['ticker']})**: {action}"
+        f"(from {current_percent} to {target_percent})\n"
+        f"  - *Rationale*: {change['recommendation']}\n\n"
+    )
+    return row, action_item
 
-def ensure_numeric_value(value, default=0.0):
-    """Ensure a value is numeric, converting from string if needed.
+def _format_changes(changes):
+    """Format the changes table and collect the buy/sell action items in one pass.
     
     Args:
-        value: Value to ensure is numeric.
-        default (float): Default value if conversion fails.
+        changes (list): List of portfolio changes.
         
     Returns:
-        float: Numeric value.
+        str: Markdown-formatted table of changes.
+        list: Action items of changes that increase a position.
+        list: Action items of changes that reduce a position.
     """
-    if isinstance(value, (int, float)):
-        return float(value)
+    parts = [
+        "## Optimization Recommendations\n\n",
+        "Based on the value investing analysis, the following changes are recommended:\n\n",
+        # Add table of recommended changes
+        "| Stock | Ticker | Current % | Target % | Change % | Change Value (€) | Recommendation |\n",
+        "|-------|--------|-----------|----------|----------|-----------------|----------------|\n"
+    ]
+    buys = []
+    sells = []
+    
+    for change in changes:
+        # Each change is formatted once for both the table and the action items
+        row, action_item = _format_change_row(change)
+        parts.append(row)
         
-    if isinstance(value, str):
-        try:
-            # Handle various formats including percentage and currency
-            clean_value = value.replace('%', '').replace(',', '.').replace('€', '').strip()
-            return float(clean_value)
-        except (ValueError, TypeError):
-            return default
+        if action_item is None:
+            continue
+        if change['change_value'] > 0:
+            buys.append(action_item)
+        else:
+            sells.append(action_item)
     
-    return default
+    return "".join(parts), buys, sells
+
+def _format_action_items(heading, action_items):
+    """Format a section of buy or sell action items in markdown.
+    
+    Args:
+        heading (str): Section heading.
+        action_items (list): Markdown action items from _format_changes.
+        
+    Returns:
+        str: Markdown-formatted section, or an empty string without action items.
+    """
+    if not action_items:
+        return ""
+    return f"### {heading}\n\n" + "".join(action_items)
 
 def format_changes_table(changes):
     """Format table of recommended changes in markdown.
@@ -649,31 +892,8 @@ def format_changes_table(changes):
     Returns:
         str: Markdown-formatted table of changes.
     """
-    markdown = "## Optimization Recommendations\n\n"
-    markdown += "Based on the value investing analysis, the following changes are recommended:\n\n"
-    
-    # Add table of recommended changes
-    markdown += "| Stock | Ticker | Current % | Target % | Change % | Change Value (€) | Recommendation |\n"
-    markdown += "|-------|--------|-----------|----------|----------|-----------------|----------------|\n"
-    
-    for change in changes:
-        markdown += f"| {change['name']} | {change['ticker']} | "
-        
-        # Ensure values are numeric
-        current_percent = ensure_numeric_value(change['current_percent'])
-        target_percent = ensure_numeric_value(change['target_percent'], current_percent)
-        change_percent = ensure_numeric_value(change['change_percent'])
-        change_value = ensure_numeric_value(change['change_value'])
-        
-        markdown += f"{current_percent:.2f}% | {target_percent:.2f}% | "
-        
-        # Format change with plus/minus sign
-        change_percent_str = f"+{change_percent:.2f}%" if change_percent >= 0 else f"{change_percent:.2f}%"
-        change_value_str = f"+{change_value:,.2f}" if change_value >= 0 else f"{change_value:,.2f}"
-        
-        markdown += f"{change_percent_str} | {change_value_str} | {change['recommendation']} |\n"
-    
-    return markdown
+    table, _, _ = _format_changes(changes)
+    return table
 
 def format_buy_recommendations(changes):
     """Format buy recommendations section in markdown.
@@ -684,23 +904,8 @@ def format_buy_recommendations(changes):
     Returns:
         str: Markdown-formatted buy recommendations.
     """
-    # Buy recommendations (positive change values)
-    buys = [c for c in changes if ensure_numeric_value(c['change_value']) > 0]
-    if not buys:
-        return ""
-        
-    markdown = "### Stocks to Buy/Increase\n\n"
-    for buy in buys:
-        # Ensure values are numeric
-        change_value = ensure_numeric_value(buy['change_value'])
-        current_percent = ensure_numeric_value(buy['current_percent'])
-        target_percent = ensure_numeric_value(buy['target_percent'], current_percent)
-        
-        markdown += f"- **{buy['name']} ({buy['ticker']})**: Increase position by €{change_value:,.2f} "
-        markdown += f"(from {current_percent:.2f}% to {target_percent:.2f}%)\n"
-        markdown += f"  - *Rationale*: {buy['recommendation']}\n\n"
-    
-    return markdown
+    _, buys, _ = _format_changes(changes)
+    return _format_action_items("Stocks to Buy/Increase", buys)
 
 def format_sell_recommendations(changes):
     """Format sell recommendations section in markdown.
@@ -711,23 +916,8 @@ def format_sell_recommendations(changes):
     Returns:
         str: Markdown-formatted sell recommendations.
     """
-    # Sell recommendations (negative change values)
-    sells = [c for c in changes if ensure_numeric_value(c['change_value']) < 0]
-    if not sells:
-        return ""
-        
-    markdown = "### Stocks to Sell/Reduce\n\n"
-    for sell in sells:
-        # Ensure values are numeric
-        change_value = ensure_numeric_value(sell['change_value'])
-        current_percent = ensure_numeric_value(sell['current_percent'])
-        target_percent = ensure_numeric_value(sell['target_percent'], current_percent)
-        
-        markdown += f"- **{sell['name']} ({sell['ticker']})**: Reduce position by €{abs(change_value):,.2f} "
-        markdown += f"(from {current_percent:.2f}% to {target_percent:.2f}%)\n"
-        markdown += f"  - *Rationale*: {sell['recommendation']}\n\n"
-    
-    return markdown
+    _, _, sells = _format_changes(changes)
+    return _format_action_items("Stocks to Sell/Reduce", sells)
 
 def format_disclaimer():
     """Format disclaimer section in markdown.
@@ -735,12 +925,12 @@ def format_disclaimer():
     Returns:
         str: Markdown-formatted disclaimer.
     """
-    markdown = "## Disclaimer\n\n"
-    markdown += "These recommendations are based on algorithmic analysis of financial data and should not be "
-    markdown += "considered financial advice. All investment decisions should be made based on your own research "
-    markdown += "and in consultation with a qualified financial advisor. Past performance is not indicative of future results.\n"
-    
-    return markdown
+    return (
+        "## Disclaimer\n\n"
+        "These recommendations are based on algorithmic analysis of financial data and should not be "
+        "considered financial advice. All investment decisions should be made based on your own research "
+        "and in consultation with a qualified financial advisor. Past performance is not indicative of future results.\n"
+    )
 
 def format_optimization_to_markdown(optimization_results, portfolio_data):
     """Format optimization results to markdown.
@@ -752,22 +942,20 @@ def format_optimization_to_markdown(optimization_results, portfolio_data):
     Returns:
         str: Markdown-formatted optimization recommendations.
     """
-    markdown = "# Portfolio Optimization Recommendations\n\n"
-    
-    # Add portfolio summary
-    markdown += format_portfolio_summary(portfolio_data, optimization_results['total_value'])
-    
-    # Add optimization summary
-    markdown += format_changes_table(optimization_results['changes'])
-    
-    # Add specific action items section
-    markdown += "\n## Action Items\n\n"
-    
-    # Add buy and sell recommendations
-    markdown += format_buy_recommendations(optimization_results['changes'])
-    markdown += format_sell_recommendations(optimization_results['changes'])
-    
-    # Add disclaimer
-    markdown += "\n" + format_disclaimer()
-    
-    return markdown 
\ No newline at end of file
+    # Buy and sell recommendations are partitioned while the table is built
+    changes_table, buys, sells = _format_changes(optimization_results['changes'])
+    return "".join([
+        "# Portfolio Optimization Recommendations\n\n",
+        # Add portfolio summary
+        format_portfolio_summary(portfolio_data, optimization_results['total_value']),
+        # Add optimization summary
+        changes_table,
+        # Add specific action items section
+        "\n## Action Items\n\n",
+        # Add buy and sell recommendations
+        _format_action_items("Stocks to Buy/Increase", buys),
+        _format_action_items("Stocks to Sell/Reduce", sells),
+        # Add disclaimer
+        "\n",
+        format_disclaimer()
+    ]) 
\ No newline at end of file
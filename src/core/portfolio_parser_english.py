@@ -20,16 +20,31 @@ def parse_portfolio_csv_english(csv_path):
     total_value = 0
     
     try:
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            
+            # Resolve the column positions once instead of building a dict per row
+            columns = {column: i for i, column in enumerate(header)}
+            security_i = columns.get('Security')
+            shares_i = columns.get('Shares')
+            price_i = columns.get('Current Price (EUR)')
+            value_i = columns.get('Market Value (EUR)')
+            weight_i = columns.get('Weight')
+            portfolio_i = columns.get('Portfolio')
+            if security_i is None:
+                # Without a Security column no row can be mapped to a stock
+                logger.warning(f"No Security column in {csv_path}")
+                reader = ()
+            min_length = max((i for i in (security_i, shares_i, price_i, value_i, weight_i, portfolio_i) if i is not None), default=-1) + 1
             
             for row in reader:
                 # Skip empty rows or cash entries
-                if not row.get('Security') or 'Cash' in row.get('Security', ''):
+                if len(row) <= security_i or not row[security_i] or 'Cash' in row[security_i]:
                     continue
                 
                 # Extract stock data
-                name = row['Security'].strip().strip('"')
+                name = row[security_i].strip().strip('"')
                 
                 # Get ticker mapping
                 ticker_info = get_stock_ticker_and_exchange(name)
@@ -37,18 +52,22 @@ def parse_portfolio_csv_english(csv_path):
                     logger.warning(f"No ticker mapping for {name}")
                     continue
                 
+                if len(row) < min_length:
+                    logger.warning(f"Incomplete row for {name}: expected {min_length} columns, got {len(row)}")
+                    continue
+                
                 try:
                     # Handle empty or missing values
-                    shares_str = row.get('Shares', '0').strip()
+                    shares_str = row[shares_i].strip() if shares_i is not None else '0'
                     shares = int(shares_str) if shares_str else 0
                     
-                    price_str = row.get('Current Price (EUR)', '0').strip()
+                    price_str = row[price_i].strip() if price_i is not None else '0'
                     price = float(price_str) if price_str else 0
                     
-                    value_str = row.get('Market Value (EUR)', '0').strip()
+                    value_str = row[value_i].strip() if value_i is not None else '0'
                     value = float(value_str) if value_str else 0
                     
-                    weight_str = row.get('Weight', '0%').replace('%', '').strip()
+                    weight_str = row[weight_i].strip().rstrip('%') if weight_i is not None else '0'
                     weight = float(weight_str) if weight_str else 0
                     
                     stock_data = {
@@ -59,13 +78,13 @@ def parse_portfolio_csv_english(csv_path):
                         'price': price,
                         'value': value,
                         'weight': weight,
-                        'portfolio': row.get('Portfolio', '')
+                        'portfolio': row[portfolio_i] if portfolio_i is not None else ''
                     }
                     
                     stocks.append(stock_data)
                     total_value += value
                     
-                except (ValueError, KeyError) as e:
+                except ValueError as e:
                     logger.warning(f"Error parsing row for {name}: {e}")
                     
     except Exception as e:
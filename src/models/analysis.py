@@ -8,7 +8,11 @@ leveraging specialized modules for specific functionalities.
 import os
 import json
 import datetime
+import functools
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
 from src.core.logger import logger
 from src.core.config import config
 from src.core.file_operations import save_markdown, save_json_data
@@ -21,11 +25,209 @@ from src.models.claude.claude_analysis import analyze_with_claude
 from src.models.prompts import build_analysis_prompt, get_openai_system_prompt
 from src.models.parsers import extract_analysis_components, format_analysis_to_markdown
 
-def get_value_investing_signals(portfolio_data, api_data, openai_client=None, anthropic_client=None, model="o3-mini"):
+class _RequestThrottle:
+    """Space out the start of AI requests made from concurrent worker threads."""
+    
+    def __init__(self, interval):
+        """Initialize the throttle.
+        
+        Args:
+            interval (float): Minimum number of seconds between request starts.
+        """
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+    
+    def wait(self):
+        """Block until the next request may start and reserve its slot."""
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_start - now
+            self._next_start = max(now, self._next_start) + self._interval
+        if delay > 0:
+            time.sleep(delay)
+
+class _AnalysisResults(dict):
+    """Analysis results whose "markdown" summary is only rendered when read.
+    
+    The CLI streams the report from the stocks, so the full markdown string
+    is built only for callers that still ask for it.
+    """
+    
+    def __missing__(self, key):
+        if key != "markdown":
+            raise KeyError(key)
+        return format_analysis_to_markdown(self["stocks"])
+    
+    def __contains__(self, key):
+        return key == "markdown" or super().__contains__(key)
+    
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+class _ResolvedStock(NamedTuple):
+    """A portfolio stock matched to its API data and ready to be analyzed."""
+    name: str
+    ticker: str
+    user_prompt: str
+
+def _resolve_stock(stock, api_data, api_keys, prompts):
+    """Match a stock to its API data and build its analysis prompt.
+    
+    Args:
+        stock (dict): Stock dictionary with name, shares, price, etc.
+        api_data (dict): Dictionary of API responses from SimplyWall.st
+        api_keys (list): (casefolded key, key) pairs of api_data for fuzzy matching
+        prompts (dict): Prompts already built in this run, keyed by id() of their company data
+        
+    Returns:
+        _ResolvedStock or None: Resolved stock, or None if it cannot be analyzed.
+    """
+    ticker = None
+    name = stock.get('name', 'Unknown')
+    try:
+        # Stocks from parse_portfolio already carry their ticker and exchange
+        ticker_info = stock if 'ticker' in stock else get_stock_ticker_and_exchange(name)
+        
+        if not ticker_info:
+            logger.warning(f"No ticker info found for {name}")
+            return None
+        
+        ticker = ticker_info.get('ticker')
+        
+        # Get API data for this company - try different possible keys
+        company_data = None
+        
+        # Try by ticker first
+        if ticker in api_data:
+            company_data = api_data[ticker]
+            logger.info(f"Found API data for ticker {ticker}")
+        # Then try by name
+        elif name in api_data:
+            company_data = api_data[name]
+            logger.info(f"Found API data for company name {name}")
+        # Try similar name variations
+        else:
+            name_folded = name.casefold()
+            ticker_folded = ticker.casefold()
+            for key_folded, key in api_keys:
+                if name_folded in key_folded or ticker_folded in key_folded:
+                    company_data = api_data[key]
+                    logger.info(f"Found API data for similar key: {key}")
+                    break
+        
+        if not company_data:
+            logger.warning(f"No API data found for {name} ({ticker})")
+            return None
+        
+        # Add ticker and name to company data for reference if not already present
+        if 'ticker' not in company_data:
+            company_data['ticker'] = ticker
+        if 'name' not in company_data:
+            company_data['name'] = name
+        
+        # Create the user prompt with all available financial data, once per
+        # company even if it is held in several portfolios
+        user_prompt = prompts.get(id(company_data))
+        if user_prompt is None:
+            logger.info(f"Building comprehensive analysis prompt for {ticker}")
+            user_prompt = prompts[id(company_data)] = build_analysis_prompt(company_data)
+            
+            # Show prompt size to monitor token usage
+            prompt_size = len(user_prompt)
+            logger.info(f"Analysis prompt for {ticker} created: {prompt_size} characters")
+        
+        return _ResolvedStock(name, ticker, user_prompt)
+        
+    except Exception as e:
+        logger.error(f"Error preparing {name} ({ticker}): {e}")
+        print(f"Error analyzing {name}: {e}")
+        return None
+
+def _analyze_stock(resolved, model, model_name, system_prompt, openai_client, anthropic_client, model_companies_dir, analysis_date, throttle, use_cache, show_progress):
+    """Analyze a single resolved stock and save its report.
+    
+    Args:
+        resolved (_ResolvedStock): Stock with its analysis prompt.
+        model (str): Model to use - either "o3-mini" or "claude-3-7"
+        model_name (str): Provider model name from the configuration.
+        system_prompt (str or None): System prompt for OpenAI, None for Claude.
+        openai_client (OpenAI, optional): OpenAI client for o3-mini model.
+        anthropic_client (Anthropic, optional): Anthropic client for Claude model.
+        model_companies_dir (str): Directory for the individual company analyses.
+        analysis_date (str): Date of the analysis in YYYY-MM-DD format.
+        throttle (_RequestThrottle): Throttle shared by all workers, waited on
+            only when a request is actually sent to the AI provider.
+        use_cache (bool): Reuse cached AI responses for unchanged prompts.
+        show_progress (bool): Print Claude's streaming progress, which is only
+            readable when a single stock is analyzed at a time.
+        
+    Returns:
+        dict or None: Structured analysis data, or None if the analysis failed.
+    """
+    name, ticker, user_prompt = resolved
+    analysis_data = None
+    try:
+        print(f"Analyzing {name} ({ticker})...")
+        start_time = time.time()
+        
+        if model.startswith("claude"):
+            # Use Claude with enhanced analysis
+            logger.info(f"Starting enhanced Claude analysis for {ticker}")
+            print(f"  - Using enhanced analysis with full data and extended thinking time")
+            response = analyze_with_claude(user_prompt, anthropic_client, model=model_name, use_cache=use_cache,
+                                           before_request=throttle.wait, show_progress=show_progress)
+        else:
+            # Use OpenAI for analysis
+            logger.info(f"Starting OpenAI analysis for {ticker}")
+            response = analyze_with_openai(system_prompt, user_prompt, openai_client, model=model_name, use_cache=use_cache,
+                                           before_request=throttle.wait)
+        
+        elapsed_time = time.time() - start_time
+        logger.info(f"Analysis completed for {ticker} in {elapsed_time:.1f}s, response size: {len(response)} characters")
+        print(f"  - Analysis of {ticker} completed in {elapsed_time:.1f} seconds")
+        
+        # Extract analysis components (recommendation, strengths, weaknesses, etc.)
+        analysis_data = extract_analysis_components(response)
+        
+        # Add ticker and name 
+        analysis_data['ticker'] = ticker
+        analysis_data['name'] = name
+        analysis_data['date'] = analysis_date
+        
+        # Log the recommendation
+        recommendation = analysis_data.get('recommendation', 'UNKNOWN')
+        logger.info(f"Recommendation for {ticker}: {recommendation}")
+        print(f"  - Recommendation for {ticker}: {recommendation}")
+        
+        # Both reports share the file name stem, e.g. BRK_B_analysis
+        file_stem = os.path.join(model_companies_dir, f"{ticker.replace('.', '_')}_analysis")
+        
+        # Save individual company analysis to file
+        company_file_path = file_stem + ".md"
+        save_markdown(response, company_file_path)
+        logger.info(f"Saved {ticker} analysis to {company_file_path}")
+        
+        # Save JSON data for later use
+        json_file_path = file_stem + ".json"
+        save_json_data(analysis_data, json_file_path)
+        logger.info(f"Saved {ticker} structured data to {json_file_path}")
+        
+        return analysis_data
+        
+    except Exception as e:
+        logger.error(f"Error analyzing {name} ({ticker}): {e}")
+        print(f"Error analyzing {name}: {e}")
+        # Keep an analysis that was produced even if saving it failed
+        return analysis_data
+
+def get_value_investing_signals(portfolio_data, api_data, openai_client=None, anthropic_client=None, model="o3-mini", use_cache=True):
     """Use AI models to analyze stocks and provide buy/sell signals.
     
     This function processes each stock individually and combines the results,
     ensuring every stock gets fully analyzed without context window limitations.
+    Stocks are analyzed concurrently by a small pool of worker threads, since
+    each analysis is dominated by waiting on the AI provider.
     
     Args:
         portfolio_data (list): List of stock dictionaries with name, shares, price, etc.
@@ -33,6 +235,8 @@ def get_value_investing_signals(portfolio_data, api_data, openai_client=None, an
         openai_client (OpenAI, optional): OpenAI client for o3-mini model.
         anthropic_client (Anthropic, optional): Anthropic client for Claude model.
         model (str): Model to use - either "o3-mini" or "claude-3-7"
+        use_cache (bool): Reuse cached AI responses for unchanged prompts. Fresh
+            responses are cached either way.
         
     Returns:
         dict: Dictionary containing the markdown analysis and structured stock results
@@ -40,128 +244,63 @@ def get_value_investing_signals(portfolio_data, api_data, openai_client=None, an
     model_short_name = "openai" if model == "o3-mini" else "claude"
     logger.info(f"Starting value investing analysis using {model} model")
     
+    analysis_config = config.get("analysis", {})
+    max_workers = analysis_config.get("max_workers", 4)
+    # Streaming progress lines of concurrent analyses would overwrite each other
+    show_progress = max_workers == 1
+    
+    # Look up the provider settings once rather than in every worker
     if model.startswith("claude"):
-        thinking_budget = config["claude"].get("thinking_budget", 32000)
+        claude_config = config["claude"]
+        model_name = claude_config["model"]
+        system_prompt = None
+        thinking_budget = claude_config.get("thinking_budget", 32000)
         logger.info(f"Using Claude with enhanced analysis mode and {thinking_budget} token thinking budget")
         print(f"Enhanced Analysis Mode: Using Claude with {thinking_budget} token thinking budget")
         print("This will provide more comprehensive and nuanced analysis, but may take longer per company")
-        print("Streaming enabled - you'll see real-time progress updates during analysis")
+        if show_progress:
+            print("Streaming enabled - you'll see real-time progress updates during analysis")
+    else:
+        model_name = config["openai"]["model"]
+        system_prompt = get_openai_system_prompt()
     
-    stock_analyses = []
     analysis_date = datetime.datetime.now().strftime("%Y-%m-%d")
     
     # Create output directory for individual company analyses
     model_companies_dir = os.path.join(config["output"]["companies_dir"], model_short_name)
     os.makedirs(model_companies_dir, exist_ok=True)
     
-    for stock in portfolio_data:
-        ticker = None
-        try:
-            name = stock.get('name', 'Unknown')
-            ticker_info = get_stock_ticker_and_exchange(name)
-            
-            if not ticker_info:
-                logger.warning(f"No ticker info found for {name}")
-                continue
-            
-            ticker = ticker_info.get('ticker')
-            exchange = ticker_info.get('exchange')
-            
-            # Get API data for this company - try different possible keys
-            company_data = None
-            
-            # Try by ticker first
-            if ticker in api_data:
-                company_data = api_data[ticker]
-                logger.info(f"Found API data for ticker {ticker}")
-            # Then try by name
-            elif name in api_data:
-                company_data = api_data[name]
-                logger.info(f"Found API data for company name {name}")
-            # Try similar name variations
-            else:
-                for key in api_data.keys():
-                    if name.lower() in key.lower() or ticker.lower() in key.lower():
-                        company_data = api_data[key]
-                        logger.info(f"Found API data for similar key: {key}")
-                        break
-            
-            if not company_data:
-                logger.warning(f"No API data found for {name} ({ticker})")
-                continue
-            
-            # Add ticker and name to company data for reference if not already present
-            if 'ticker' not in company_data:
-                company_data['ticker'] = ticker
-            if 'name' not in company_data:
-                company_data['name'] = name
-            
-            print(f"Analyzing {name} ({ticker})...")
-            
-            # Create the user prompt with all available financial data
-            logger.info(f"Building comprehensive analysis prompt for {ticker}")
-            user_prompt = build_analysis_prompt(company_data)
-            
-            # Show prompt size to monitor token usage
-            prompt_size = len(user_prompt)
-            logger.info(f"Analysis prompt for {ticker} created: {prompt_size} characters")
-            
-            start_time = time.time()
-            
-            if model.startswith("claude"):
-                # Use Claude with enhanced analysis
-                logger.info(f"Starting enhanced Claude analysis for {ticker}")
-                print(f"  - Using enhanced analysis with full data and extended thinking time")
-                response = analyze_with_claude(user_prompt, anthropic_client, model=config["claude"]["model"])
-            else:
-                # Use OpenAI for analysis
-                logger.info(f"Starting OpenAI analysis for {ticker}")
-                system_prompt = get_openai_system_prompt()
-                response = analyze_with_openai(system_prompt, user_prompt, openai_client, model=config["openai"]["model"])
-            
-            elapsed_time = time.time() - start_time
-            logger.info(f"Analysis completed for {ticker} in {elapsed_time:.1f}s, response size: {len(response)} characters")
-            print(f"  - Analysis completed in {elapsed_time:.1f} seconds")
-            
-            # Extract analysis components (recommendation, strengths, weaknesses, etc.)
-            analysis_data = extract_analysis_components(response)
-            
-            # Add ticker and name 
-            analysis_data['ticker'] = ticker
-            analysis_data['name'] = name
-            analysis_data['date'] = analysis_date
-            
-            # Log the recommendation
-            recommendation = analysis_data.get('recommendation', 'UNKNOWN')
-            logger.info(f"Recommendation for {ticker}: {recommendation}")
-            print(f"  - Recommendation: {recommendation}")
-            
-            # Add to the results list
-            stock_analyses.append(analysis_data)
-            
-            # Save individual company analysis to file
-            company_filename = f"{ticker.replace('.', '_')}_analysis.md"
-            company_file_path = os.path.join(model_companies_dir, company_filename)
-            save_markdown(response, company_file_path)
-            logger.info(f"Saved {ticker} analysis to {company_file_path}")
-            
-            # Save JSON data for later use
-            json_filename = f"{ticker.replace('.', '_')}_analysis.json"
-            json_file_path = os.path.join(model_companies_dir, json_filename)
-            save_json_data(analysis_data, json_file_path)
-            logger.info(f"Saved {ticker} structured data to {json_file_path}")
-            
-            # Add a small delay between companies to avoid rate limiting
-            time.sleep(1)
-            
-        except Exception as e:
-            logger.error(f"Error analyzing {name} ({ticker}): {e}")
-            print(f"Error analyzing {name}: {e}")
+    throttle = _RequestThrottle(analysis_config.get("request_interval", 1.0))
+    
+    # Resolve every stock to its API data and prompt before dispatching any
+    # AI requests; this also keeps the shared company_data dicts single-threaded.
+    # The API keys are casefolded once instead of once per stock and key.
+    api_keys = [(key.casefold(), key) for key in api_data]
+    # api_data keeps every company dict alive, so their ids are stable for the run
+    prompts = {}
+    resolved_stocks = [_resolve_stock(stock, api_data, api_keys, prompts) for stock in portfolio_data]
+    resolved_stocks = [resolved for resolved in resolved_stocks if resolved]
+    logger.info(f"Resolved {len(resolved_stocks)} of {len(portfolio_data)} stocks for analysis")
+    
+    analyze_stock = functools.partial(
+        _analyze_stock,
+        model=model,
+        model_name=model_name,
+        system_prompt=system_prompt,
+        openai_client=openai_client,
+        anthropic_client=anthropic_client,
+        model_companies_dir=model_companies_dir,
+        analysis_date=analysis_date,
+        throttle=throttle,
+        use_cache=use_cache,
+        show_progress=show_progress
+    )
+    
+    logger.info(f"Analyzing {len(resolved_stocks)} stocks with up to {max_workers} concurrent requests")
     
-    # Format all analyses into a summary markdown document
-    markdown_content = format_analysis_to_markdown(stock_analyses)
+    # executor.map keeps the results in portfolio order
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        stock_analyses = [analysis for analysis in executor.map(analyze_stock, resolved_stocks) if analysis]
     
-    return {
-        "markdown": markdown_content, 
-        "stocks": stock_analyses
-    } 
\ No newline at end of file
+    # The summary markdown is rendered on first access of the "markdown" key
+    return _AnalysisResults(stocks=stock_analyses) 
\ No newline at end of file
@@ -8,16 +8,11 @@ using Anthropic's Claude models.
 import time as _time
 from src.core.logger import logger as _logger
 from src.core.config import config as _config
+from src.models.response_cache import load_cached_response as _load_cached_response
+from src.models.response_cache import save_cached_response as _save_cached_response
 
-def _get_system_prompt():
-    """Get the system prompt for Claude analysis.
-    
-    This function is private and only used within this module.
-    
-    Returns:
-        str: System prompt for Claude
-    """
-    return """You are a value investing expert with deep knowledge of financial analysis, following principles of Warren Buffett and Benjamin Graham.
+# System prompt for Claude analysis, private to this module
+_SYSTEM_PROMPT = """You are a value investing expert with deep knowledge of financial analysis, following principles of Warren Buffett and Benjamin Graham.
 
 You have been given extended thinking time to perform an exceptionally thorough analysis of a company. Use this time to:
 
@@ -78,13 +73,32 @@ IMPORTANT: Always include the Current Price in your Price Analysis section, exac
 This format will be used to guide investment decisions, so be thorough and objective. This is an enhanced analysis using comprehensive data, so provide detailed insights beyond a typical stock report.
 """
 
-def analyze_with_claude(user_prompt, client, model="claude-3-7-sonnet-20250219"):
+def _log_progress(message, end="\n"):
+    """Send a progress message to the debug log instead of the terminal.
+    
+    This function is private and only used within this module.
+    
+    Args:
+        message (str): Progress message.
+        end (str, optional): Ignored; accepted for compatibility with print.
+    """
+    _logger.debug(message.strip())
+
+def analyze_with_claude(user_prompt, client, model="claude-3-7-sonnet-20250219", use_cache=True, before_request=None,
+                        show_progress=True):
     """Use Anthropic's Claude model to analyze financial data.
     
     Args:
         user_prompt (str): The prompt to send to Claude.
         client (Anthropic): Anthropic client instance.
         model (str, optional): Claude model to use. Defaults to "claude-3-7-sonnet-20250219".
+        use_cache (bool, optional): Reuse a cached response for an identical request.
+            Fresh responses are cached either way. Defaults to True.
+        before_request (callable, optional): Called just before the API request,
+            but not when the response comes from the cache. Defaults to None.
+        show_progress (bool, optional): Print streaming progress to the terminal.
+            Concurrent analyses pass False, since their progress lines would
+            overwrite each other; progress then goes to the debug log. Defaults to True.
         
     Returns:
         str: Text response from Claude.
@@ -92,19 +106,26 @@ def analyze_with_claude(user_prompt, client, model="claude-3-7-sonnet-20250219")
     try:
         thinking_budget = _config["claude"].get("thinking_budget", 32000)
         
-        # Get system prompt from private function
-        system_prompt = _get_system_prompt()
+        cache_key = (model, thinking_budget, _SYSTEM_PROMPT, user_prompt)
+        if use_cache:
+            cached_response = _load_cached_response(*cache_key)
+            if cached_response is not None:
+                return cached_response
+        
+        if before_request:
+            before_request()
+        
+        progress = print if show_progress else _log_progress
         
         _logger.info(f"Requesting detailed company analysis from Claude ({model}) with {thinking_budget} token thinking budget...")
-        print(f"Starting analysis with {thinking_budget} token thinking budget...")
-        print("This will take some time. Progress will be shown as Claude processes the data...")
+        progress(f"Starting analysis with {thinking_budget} token thinking budget...")
+        progress("This will take some time. Progress will be shown as Claude processes the data...")
         
         start_time = _time.time()
         
-        # Variables to track streaming progress - scoped only to this function
-        full_response = ""
-        current_thinking = ""
-        current_text = ""
+        # Variables to track streaming progress - scoped only to this function.
+        # The SDK accumulates the streamed thinking and text in its message
+        # snapshot, so the chunks are only counted here.
         thinking_in_progress = False
         text_in_progress = False
         thinking_chunks = 0
@@ -117,81 +138,84 @@ def analyze_with_claude(user_prompt, client, model="claude-3-7-sonnet-20250219")
             model=model,
             max_tokens=thinking_budget + 10000,  # Increased output tokens for more comprehensive analysis
             thinking={"type": "enabled", "budget_tokens": thinking_budget},
-            system=system_prompt,
+            system=_SYSTEM_PROMPT,
             messages=[
                 {"role": "user", "content": user_prompt}
             ],
             temperature=1.0  # Must be 1.0 when thinking is enabled
         ) as stream:
             # Display initial progress message
-            print("Claude's thinking process has started...")
+            progress("Claude's thinking process has started...")
             
             # Process the streaming events
             for event in stream:
                 current_time = _time.time()
+                event_type = event.type
                 
-                # Handle message start
-                if event.type == "message_start":
-                    pass
+                # Handle content block delta (the actual content chunks) first,
+                # since nearly all events in the stream are deltas
+                if event_type == "content_block_delta":
+                    delta_type = event.delta.type
+                    if delta_type == "thinking_delta" and thinking_in_progress:
+                        thinking_chunks += 1
+                        # Periodically show progress for thinking
+                        if current_time - last_progress_time > progress_interval:
+                            elapsed = current_time - start_time
+                            progress(f"Still thinking... ({elapsed:.1f}s elapsed, {thinking_chunks} thinking chunks processed)")
+                            last_progress_time = current_time
+                    elif delta_type == "text_delta" and text_in_progress:
+                        text_chunks += 1
+                        # Show progress for text generation
+                        if text_chunks % 20 == 0:  # Show more frequent updates for text
+                            progress_char = "." * (text_chunks // 20 % 4 + 1)
+                            progress(f"Generating report{progress_char}", end="\r")
                 
                 # Handle content block start
-                elif event.type == "content_block_start":
+                elif event_type == "content_block_start":
                     if event.content_block.type == "thinking":
                         thinking_in_progress = True
                         text_in_progress = False
                         thinking_chunks = 0
                         if current_time - last_progress_time > progress_interval:
-                            print("Claude is analyzing the company data...")
+                            progress("Claude is analyzing the company data...")
                             last_progress_time = current_time
                     elif event.content_block.type == "text":
                         text_in_progress = True
                         thinking_in_progress = False
                         text_chunks = 0
-                        print("\nAnalysis complete! Claude is now generating the report...")
-                
-                # Handle content block delta (the actual content chunks)
-                elif event.type == "content_block_delta":
-                    if hasattr(event.delta, "thinking") and thinking_in_progress:
-                        thinking_chunk = event.delta.thinking
-                        current_thinking += thinking_chunk
-                        thinking_chunks += 1
-                        # Periodically show progress for thinking
-                        if current_time - last_progress_time > progress_interval:
-                            elapsed = current_time - start_time
-                            print(f"Still thinking... ({elapsed:.1f}s elapsed, {thinking_chunks} thinking chunks processed)")
-                            last_progress_time = current_time
-                    elif hasattr(event.delta, "text") and text_in_progress:
-                        text_chunk = event.delta.text
-                        current_text += text_chunk
-                        text_chunks += 1
-                        # Show progress for text generation
-                        if text_chunks % 20 == 0:  # Show more frequent updates for text
-                            progress_char = "." * (text_chunks // 20 % 4 + 1)
-                            print(f"Generating report{progress_char}", end="\r")
+                        progress("\nAnalysis complete! Claude is now generating the report...")
                 
                 # Handle content block stop
-                elif event.type == "content_block_stop":
+                elif event_type == "content_block_stop":
                     if thinking_in_progress:
                         thinking_in_progress = False
-                        _logger.info(f"Thinking complete: {len(current_thinking)} characters in {thinking_chunks} chunks")
+                        _logger.info(f"Thinking complete: {len(event.content_block.thinking)} characters in {thinking_chunks} chunks")
                     elif text_in_progress:
                         text_in_progress = False
-                        _logger.info(f"Text complete: {len(current_text)} characters in {text_chunks} chunks")
+                        _logger.info(f"Text complete: {len(event.content_block.text)} characters in {text_chunks} chunks")
                 
                 # Handle message delta
-                elif event.type == "message_delta":
+                elif event_type == "message_delta":
                     if event.delta.stop_reason:
                         _logger.info(f"Message stopped with reason: {event.delta.stop_reason}")
                 
                 # Handle message stop (end of stream)
-                elif event.type == "message_stop":
-                    full_response = current_text
+                elif event_type == "message_stop":
                     _logger.info("Streaming complete")
+            
+            # Take the report from the text blocks of the accumulated message
+            final_message = stream.get_final_message()
+            full_response = "".join(
+                block.text for block in final_message.content if block.type == "text"
+            )
         
         elapsed_time = _time.time() - start_time
         _logger.info(f"Claude company analysis completed in {elapsed_time:.1f}s")
-        print(f"\nCompany analysis complete! (took {elapsed_time:.1f} seconds)")
+        progress(f"\nCompany analysis complete! (took {elapsed_time:.1f} seconds)")
         
+        # Don't cache a report that was cut off at the token limit
+        if full_response and final_message.stop_reason != "max_tokens":
+            _save_cached_response(full_response, *cache_key)
         return full_response
         
     except Exception as e:
@@ -7,6 +7,43 @@ with proper error handling and configuration.
 
 import os as _os
 from src.core.logger import logger as _logger
+from src.core.config import config as _config
+
+# Warning logged for each provider when its API key is missing or still a placeholder
+_INVALID_KEY_WARNINGS = {
+    "openai": "Invalid OpenAI API key. Analysis will not be available.",
+    "anthropic": "Invalid Anthropic API key. Claude analysis will not be available.",
+}
+
+def _validate_api_key(provider, api_key):
+    """Check that an API key is set and is not a template placeholder.
+    
+    This function is private and only used within this module.
+    
+    Args:
+        provider (str): Provider name, a key of _INVALID_KEY_WARNINGS.
+        api_key (str): API key to check.
+        
+    Returns:
+        bool: True if the key can be used, False otherwise.
+    """
+    if not api_key or api_key.startswith("your_"):
+        _logger.warning(_INVALID_KEY_WARNINGS[provider])
+        return False
+    return True
+
+def _max_retries():
+    """Get the number of retries for rate-limited or failed AI requests.
+    
+    This function is private and only used within this module. The SDK
+    clients retry rate limit (429), overload and server errors with
+    exponential backoff, honouring any Retry-After header.
+    
+    Returns:
+        int: Maximum number of retries per request, the SDK default of 2
+            unless analysis.max_retries is configured.
+    """
+    return _config.get("analysis", {}).get("max_retries", 2)
 
 def create_openai_client(api_key):
     """Create an OpenAI client.
@@ -17,14 +54,14 @@ def create_openai_client(api_key):
     Returns:
         OpenAI: OpenAI client, or None if creation failed.
     """
+    # Validate before importing so an unusable key skips the SDK import
+    if not _validate_api_key("openai", api_key):
+        return None
+    
     try:
         from openai import OpenAI
         
-        if not api_key or api_key.startswith("your_"):
-            _logger.warning("Invalid OpenAI API key. Analysis will not be available.")
-            return None
-        
-        client = OpenAI(api_key=api_key)
+        client = OpenAI(api_key=api_key, max_retries=_max_retries())
         return client
     except Exception as e:
         _logger.error(f"Error creating OpenAI client: {e}")
@@ -39,26 +76,21 @@ def create_anthropic_client(api_key=None):
     Returns:
         Anthropic: Anthropic client, or None if creation failed.
     """
-    # Check if Anthropic is available - moved inside function to minimize scope
+    if not api_key:
+        api_key = _os.getenv("ANTHROPIC_API_KEY")
+    
+    # Validate before importing so an unusable key skips the SDK import
+    if not _validate_api_key("anthropic", api_key):
+        return None
+    
     try:
         import anthropic
-        anthropic_available = True
     except ImportError:
-        anthropic_available = False
-        
-    if not anthropic_available:
         _logger.error("Anthropic package not installed. Please install with 'pip install anthropic'")
         return None
         
     try:
-        if not api_key:
-            api_key = _os.getenv("ANTHROPIC_API_KEY")
-            
-        if not api_key or api_key.startswith("your_"):
-            _logger.warning("Invalid Anthropic API key. Claude analysis will not be available.")
-            return None
-        
-        client = anthropic.Anthropic(api_key=api_key)
+        client = anthropic.Anthropic(api_key=api_key, max_retries=_max_retries())
         return client
     except Exception as e:
         _logger.error(f"Error creating Anthropic client: {e}")
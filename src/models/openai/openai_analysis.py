@@ -7,8 +7,9 @@ using OpenAI models.
 
 from src.core.logger import logger
 from src.core.config import config
+from src.models.response_cache import load_cached_response, save_cached_response
 
-def analyze_with_openai(system_prompt, user_prompt, client, model="o3-mini"):
+def analyze_with_openai(system_prompt, user_prompt, client, model="o3-mini", use_cache=True, before_request=None):
     """Send analysis request to OpenAI.
     
     Args:
@@ -16,6 +17,10 @@ def analyze_with_openai(system_prompt, user_prompt, client, model="o3-mini"):
         user_prompt (str): User prompt with financial data
         client (OpenAI): OpenAI client
         model (str): OpenAI model to use
+        use_cache (bool): Reuse a cached response for an identical request.
+            Fresh responses are cached either way.
+        before_request (callable, optional): Called just before the API request,
+            but not when the response comes from the cache.
         
     Returns:
         str: Response text
@@ -23,6 +28,15 @@ def analyze_with_openai(system_prompt, user_prompt, client, model="o3-mini"):
     # Add high-reasoning effort if configured
     reasoning_effort = "high" if config["openai"].get("reasoning_effort") == "high" else "auto"
     
+    cache_key = (model, reasoning_effort, system_prompt, user_prompt)
+    if use_cache:
+        cached_response = load_cached_response(*cache_key)
+        if cached_response is not None:
+            return cached_response
+    
+    if before_request:
+        before_request()
+    
     try:
         response = client.chat.completions.create(
             model=model,
@@ -32,7 +46,11 @@ def analyze_with_openai(system_prompt, user_prompt, client, model="o3-mini"):
             ],
             reasoning_effort=reasoning_effort
         )
-        return response.choices[0].message.content
+        content = response.choices[0].message.content
+        # Don't cache a report that was cut off at the token limit
+        if content and response.choices[0].finish_reason != "length":
+            save_cached_response(content, *cache_key)
+        return content
     except Exception as e:
         logger.error(f"Error calling OpenAI API: {e}")
         return f"Error: {e}" 
\ No newline at end of file
@@ -8,44 +8,69 @@ data from AI-generated analysis responses.
 import re as _re
 import datetime as _datetime
 
-def _extract_recommendation(response):
-    """Extract BUY/SELL/HOLD recommendation from the response.
+def _extract_recommendation(recommendation):
+    """Normalize the recommendation to BUY/SELL/HOLD.
     
     Args:
-        response (str): AI model response text
+        recommendation (str or None): Content of the recommendation section
         
     Returns:
         str or None: Normalized recommendation or None if not found
     """
-    recommendation_match = _re.search(r'(?:^## |^#|^)Recommendation:?\s*(.*?)$', response, _re.MULTILINE | _re.IGNORECASE)
-    if recommendation_match:
-        recommendation = recommendation_match.group(1).strip()
-        # Normalize to just BUY, SELL, or HOLD
-        if 'buy' in recommendation.lower():
+    if recommendation is not None:
+        # Normalize to just BUY, SELL, or HOLD; BUY wins over SELL over HOLD
+        # wherever the words appear, so each is checked in turn
+        recommendation_lower = recommendation.lower()
+        if 'buy' in recommendation_lower:
             return 'BUY'
-        elif 'sell' in recommendation.lower():
+        elif 'sell' in recommendation_lower:
             return 'SELL'
-        elif 'hold' in recommendation.lower():
+        elif 'hold' in recommendation_lower:
             return 'HOLD'
         else:
             return recommendation
     return None
 
-def _extract_section_content(response, section_name):
-    """Extract content from a specific section of the analysis.
+# Sections of the analysis report, in report order
+_SECTION_NAMES = (
+    "Recommendation", "Summary", "Strengths", "Weaknesses", "Competitive Analysis", "Management Assessment",
+    "Financial Health", "Growth Prospects", "Price Analysis", "Investment Rationale", "Risk Factors"
+)
+
+# A section header at the start of a line; the matched group identifies the section
+_SECTION_HEADER_RE = _re.compile(
+    r'^(?:## |#)?(?:' + '|'.join(f'({name})' for name in _SECTION_NAMES) + ')',
+    _re.MULTILINE | _re.IGNORECASE
+)
+
+# Section content following a header, up to the next header or end of line
+_SECTION_CONTENT_RE = _re.compile(r':?\s*(.*?)(?=(?:^## |^#|$))', _re.MULTILINE | _re.DOTALL)
+
+# The recommendation runs to the end of its line even if that line starts with '#'
+_RECOMMENDATION_CONTENT_RE = _re.compile(r':?\s*(.*?)$', _re.MULTILINE)
+
+def _extract_sections(response):
+    """Extract the content of all sections in a single pass over the analysis.
     
     Args:
         response (str): AI model response text
-        section_name (str): Name of the section to extract
         
     Returns:
-        str or None: Section content or None if not found
+        dict: Content of the first occurrence of each section found, keyed by section name
     """
-    pattern = r'(?:^## |^#|^){}:?\s*(.*?)(?=(?:^## |^#|$))'.format(section_name)
-    match = _re.search(pattern, response, _re.MULTILINE | _re.DOTALL | _re.IGNORECASE)
-    if match:
-        return match.group(1).strip()
-    return None
+    sections = {}
+    for header in _SECTION_HEADER_RE.finditer(response):
+        section_name = _SECTION_NAMES[header.lastindex - 1]
+        if section_name not in sections:
+            content_re = _RECOMMENDATION_CONTENT_RE if section_name == "Recommendation" else _SECTION_CONTENT_RE
+            content = content_re.match(response, header.end())
+            sections[section_name] = content.group(1).strip()
+            if len(sections) == len(_SECTION_NAMES):
+                break
+    return sections
+
+# A markdown bullet point line
+_BULLET_RE = _re.compile(r'^-\s*(.*?)$', _re.MULTILINE)
 
 def _extract_bullet_points(section_text):
     """Extract bullet points from a section.
@@ -59,57 +84,56 @@ def _extract_bullet_points(section_text):
     if not section_text:
         return []
         
-    items = _re.findall(r'^-\s*(.*?)$', section_text, _re.MULTILINE)
+    items = _BULLET_RE.findall(section_text)
     return [item.strip() for item in items if item.strip()]
 
-def _extract_price_targets(response):
+# Price targets and valuation metrics in the price analysis section. Each field is
+# matched inside a lookahead, so one scan finds every field even where their
+# matches overlap; the matched group identifies the field.
+_PRICE_FIELDS = ('current_price', 'intrinsic_value', 'margin_of_safety', 'valuation_method')
+_PRICE_FIELD_RE = _re.compile(
+    r'(?=Current Price:.*?[$€£¥]([0-9.,]+)'
+    r'|Intrinsic Value:.*?[$€£¥]([0-9.,]+)'
+    r'|Margin of Safety:.*?([0-9.,]+)%'
+    r'|Valuation Method\(s\):.*?([^\n]+))',
+    _re.IGNORECASE
+)
+
+def _extract_price_targets(price_analysis):
     """Extract price targets and valuation metrics from the price analysis section.
     
     Args:
-        response (str): AI model response text
+        price_analysis (str): Content of the price analysis section
         
     Returns:
         dict: Dictionary of price targets and metrics
     """
     price_targets = {}
     
-    # First get the price analysis section
-    price_analysis = _extract_section_content(response, "Price Analysis")
     if not price_analysis:
         return price_targets
     
-    # Extract current price
-    current_price_match = _re.search(r'Current Price:.*?[$€£¥]([0-9.,]+)', price_analysis, _re.IGNORECASE)
-    if current_price_match:
-        try:
-            # Handle potential commas in number format
-            price_str = current_price_match.group(1).replace(',', '')
-            price_targets['current_price'] = float(price_str)
-        except (ValueError, IndexError):
-            pass
-    
-    # Extract intrinsic value
-    intrinsic_match = _re.search(r'Intrinsic Value:.*?[$€£¥]([0-9.,]+)', price_analysis, _re.IGNORECASE)
-    if intrinsic_match:
-        try:
-            value_str = intrinsic_match.group(1).replace(',', '')
-            price_targets['intrinsic_value'] = float(value_str)
-        except (ValueError, IndexError):
-            pass
-    
-    # Extract margin of safety
-    safety_match = _re.search(r'Margin of Safety:.*?([0-9.,]+)%', price_analysis, _re.IGNORECASE)
-    if safety_match:
-        try:
-            safety_str = safety_match.group(1).replace(',', '')
-            price_targets['margin_of_safety'] = float(safety_str)
-        except (ValueError, IndexError):
-            pass
-            
-    # Extract valuation method
-    valuation_method_match = _re.search(r'Valuation Method\(s\):.*?([^\n]+)', price_analysis, _re.IGNORECASE)
-    if valuation_method_match:
-        price_targets['valuation_method'] = valuation_method_match.group(1).strip()
+    # Keep the first match of each field
+    values = dict.fromkeys(_PRICE_FIELDS)
+    found = 0
+    for field_match in _PRICE_FIELD_RE.finditer(price_analysis):
+        field = _PRICE_FIELDS[field_match.lastindex - 1]
+        if values[field] is None:
+            values[field] = field_match.group(field_match.lastindex)
+            found += 1
+            if found == len(_PRICE_FIELDS):
+                break
+    
+    # Convert the numeric fields, handling potential commas in number format
+    for field in ('current_price', 'intrinsic_value', 'margin_of_safety'):
+        if values[field] is not None:
+            try:
+                price_targets[field] = float(values[field].replace(',', ''))
+            except ValueError:
+                pass
+    
+    if values['valuation_method'] is not None:
+        price_targets['valuation_method'] = values['valuation_method'].strip()
     
     return price_targets
 
@@ -139,26 +163,24 @@ def extract_analysis_components(response):
     }
     
     # Extract individual components using helper functions
-    components['recommendation'] = _extract_recommendation(response)
-    components['summary'] = _extract_section_content(response, "Summary")
+    sections = _extract_sections(response)
+    components['recommendation'] = _extract_recommendation(sections.get("Recommendation"))
+    components['summary'] = sections.get("Summary")
     
     # Extract bullet point lists
-    strengths_section = _extract_section_content(response, "Strengths")
-    components['strengths'] = _extract_bullet_points(strengths_section)
-    
-    weaknesses_section = _extract_section_content(response, "Weaknesses")
-    components['weaknesses'] = _extract_bullet_points(weaknesses_section)
+    components['strengths'] = _extract_bullet_points(sections.get("Strengths"))
+    components['weaknesses'] = _extract_bullet_points(sections.get("Weaknesses"))
     
     # Extract price targets
-    components['price_targets'] = _extract_price_targets(response)
+    components['price_targets'] = _extract_price_targets(sections.get("Price Analysis"))
     
     # Extract other narrative sections
-    components['rationale'] = _extract_section_content(response, "Investment Rationale")
-    components['competitive_analysis'] = _extract_section_content(response, "Competitive Analysis")
-    components['management_assessment'] = _extract_section_content(response, "Management Assessment")
-    components['financial_health'] = _extract_section_content(response, "Financial Health")
-    components['growth_prospects'] = _extract_section_content(response, "Growth Prospects")
-    components['risk_factors'] = _extract_section_content(response, "Risk Factors")
+    components['rationale'] = sections.get("Investment Rationale")
+    components['competitive_analysis'] = sections.get("Competitive Analysis")
+    components['management_assessment'] = sections.get("Management Assessment")
+    components['financial_health'] = sections.get("Financial Health")
+    components['growth_prospects'] = sections.get("Growth Prospects")
+    components['risk_factors'] = sections.get("Risk Factors")
     
     return components
 
@@ -201,22 +223,21 @@ def _format_list_for_table(items, max_items=2):
     
     return text
 
-def format_analysis_to_markdown(stock_analyses):
-    """Format stock analyses into markdown.
+def iter_analysis_markdown(stock_analyses):
+    """Generate the portfolio analysis markdown section by section.
     
     Args:
         stock_analyses (list): List of dictionaries with stock analysis results.
         
-    Returns:
-        str: Markdown-formatted analysis.
+    Yields:
+        str: Consecutive chunks of the markdown-formatted analysis.
     """
-    # Combine all analyses into a single markdown table
-    markdown_output = "# Portfolio Value Investing Analysis\n\n"
-    markdown_output += f"Analysis Date: {_datetime.datetime.now().strftime('%Y-%m-%d')}\n\n"
+    yield "# Portfolio Value Investing Analysis\n\n"
+    yield f"Analysis Date: {_datetime.datetime.now().strftime('%Y-%m-%d')}\n\n"
     
     # Create the table header
-    markdown_output += "| Stock (Ticker) | Recommendation | Summary | Key Strengths | Key Weaknesses |\n"
-    markdown_output += "|----------------|---------------|---------|--------------|----------------|\n"
+    yield "| Stock (Ticker) | Recommendation | Summary | Key Strengths | Key Weaknesses |\n"
+    yield "|----------------|---------------|---------|--------------|----------------|\n"
     
     # Add each stock's analysis to the table
     for analysis in stock_analyses:
@@ -232,12 +253,21 @@ def format_analysis_to_markdown(stock_analyses):
         weaknesses_text = _format_list_for_table(analysis.get('weaknesses', []))
         
         # Format cells for markdown table
-        markdown_output += f"| {name_with_ticker} | {recommendation} | {summary} | {strengths_text} | {weaknesses_text} |\n"
+        yield f"| {name_with_ticker} | {recommendation} | {summary} | {strengths_text} | {weaknesses_text} |\n"
     
     # Add summary and notes
-    markdown_output += "\n## Analysis Summary\n\n"
-    markdown_output += "This analysis was performed using SimplyWall.st financial statements data processed through AI analysis. "
-    markdown_output += "Each recommendation is based on value investing principles, focusing on company fundamentals, competitive advantages, and margin of safety.\n\n"
-    markdown_output += "Remember that this analysis is one input for investment decisions and should be combined with your own research and risk assessment."
+    yield "\n## Analysis Summary\n\n"
+    yield ("This analysis was performed using SimplyWall.st financial statements data processed through AI analysis. "
+           "Each recommendation is based on value investing principles, focusing on company fundamentals, competitive advantages, and margin of safety.\n\n")
+    yield "Remember that this analysis is one input for investment decisions and should be combined with your own research and risk assessment."
+
+def format_analysis_to_markdown(stock_analyses):
+    """Format stock analyses into markdown.
     
-    return markdown_output 
\ No newline at end of file
+    Args:
+        stock_analyses (list): List of dictionaries with stock analysis results.
+        
+    Returns:
+        str: Markdown-formatted analysis.
+    """
+    return "".join(iter_analysis_markdown(stock_analyses))
@@ -0,0 +1,78 @@
+"""
+Response cache module for AI analyses.
+
+This module stores AI responses on disk keyed by a hash of the request,
+so re-running an analysis on unchanged data does not repeat the API call.
+"""
+
+import os
+import hashlib
+import tempfile
+from src.core.logger import logger
+from src.core.config import config
+
+def _cache_path(key_parts):
+    """Get the cache file path for a request.
+
+    Args:
+        key_parts (tuple): Values that together identify the request.
+
+    Returns:
+        str: Path of the cache file for the request.
+    """
+    key = hashlib.sha256("\0".join(map(str, key_parts)).encode("utf-8")).hexdigest()
+    cache_dir = config["output"].get("response_cache_dir", "data/cache/responses")
+    return os.path.join(cache_dir, key[:2], key)
+
+def load_cached_response(*key_parts):
+    """Load a cached AI response.
+
+    Args:
+        *key_parts: Values that together identify the request, such as the
+            model, the prompts and any generation settings.
+
+    Returns:
+        str: Cached response, or None if the request has not been cached.
+    """
+    cache_file = _cache_path(key_parts)
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            response = f.read()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning(f"Error reading cached response {cache_file}: {e}")
+        return None
+
+    logger.info(f"Using cached response from {cache_file}")
+    return response
+
+def save_cached_response(response, *key_parts):
+    """Save an AI response to the cache.
+
+    The response is written to a temporary file and renamed into place, so
+    concurrent analyses never read a partially written cache entry.
+
+    Args:
+        response (str): Response text to cache.
+        *key_parts: Values that together identify the request.
+
+    Returns:
+        bool: True if successful, False otherwise.
+    """
+    cache_file = _cache_path(key_parts)
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+
+        fd, temp_file = tempfile.mkstemp(dir=os.path.dirname(cache_file), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(response)
+            os.replace(temp_file, cache_file)
+        except BaseException:
+            os.unlink(temp_file)
+            raise
+        return True
+    except Exception as e:
+        logger.warning(f"Error caching response to {cache_file}: {e}")
+        return False
@@ -56,7 +56,7 @@ def main():
     api_data_file = "data/raw/api_data.json"
     
     try:
-        with open(api_data_file, "r") as f:
+        with open(api_data_file, "r", encoding="utf-8") as f:
             api_data = json.load(f)
             company_count = len(api_data)
             print(f"Loaded API data for {company_count} companies from {api_data_file}")
@@ -59,7 +59,7 @@ def main():
     api_data_file = "data/raw/api_data.json"
     
     try:
-        with open(api_data_file, "r") as f:
+        with open(api_data_file, "r", encoding="utf-8") as f:
             api_data = json.load(f)
             print(f"Loaded API data from {api_data_file}")
     except Exception as e:
@@ -8,6 +8,58 @@ import requests
 from src.core.logger import logger
 from src.core.config import config
 
+# Company fields requested from the API, shared by the single and batched queries
+_COMPANY_FIELDS = """
+        id
+        name
+        exchangeSymbol
+        tickerSymbol
+        marketCapUSD
+        statements {
+          name
+          title
+          area
+          type
+          value
+          outcome
+          description
+          severity
+          outcomeName
+        }
+"""
+
+_SEARCH_FIELDS = """
+        id
+        name
+        exchangeSymbol
+        tickerSymbol
+"""
+
+def _select_company_id(companies, ticker, exchange):
+    """Pick the company ID matching a ticker and exchange from search results.
+
+    Args:
+        companies (list): Companies returned by the searchCompanies query.
+        ticker (str): Stock ticker symbol.
+        exchange (str): Stock exchange.
+
+    Returns:
+        str: Company ID, the first result's ID if there is no exact match,
+            or None if there are no results.
+    """
+    for company in companies:
+        if (company["tickerSymbol"].upper() == ticker.upper() and 
+            company["exchangeSymbol"].upper() == exchange.upper()):
+            logger.info(f"Found company ID: {company['id']} for {ticker} on {exchange}")
+            return company["id"]
+    
+    # If exact match not found but we have results, use the first one
+    if companies:
+        logger.warning(f"Exact match not found. Using first result with ID: {companies[0]['id']}")
+        return companies[0]["id"]
+    
+    return None
+
 def fetch_company_data(ticker, exchange, api_token, max_retries=None):
     """Fetch company data from SimplyWall.st GraphQL API with retry logic.
 
@@ -34,14 +86,9 @@ def fetch_company_data(ticker, exchange, api_token, max_retries=None):
     
     search_query_gql = """
     query searchCompanies($query: String!) {
-      searchCompanies(query: $query) {
-        id
-        name
-        exchangeSymbol
-        tickerSymbol
-      }
+      searchCompanies(query: $query) {%s      }
     }
-    """
+    """ % _SEARCH_FIELDS
     
     search_variables = {
         "query": search_query
@@ -82,17 +129,7 @@ def fetch_company_data(ticker, exchange, api_token, max_retries=None):
             # Find the company in search results that matches our ticker and exchange
             if "data" in search_data and "searchCompanies" in search_data["data"]:
                 companies = search_data["data"]["searchCompanies"]
-                for company in companies:
-                    if (company["tickerSymbol"].upper() == ticker.upper() and 
-                        company["exchangeSymbol"].upper() == exchange.upper()):
-                        company_id = company["id"]
-                        logger.info(f"Found company ID: {company_id} for {ticker} on {exchange}")
-                        break
-                
-                # If exact match not found but we have results, use the first one
-                if company_id is None and companies:
-                    company_id = companies[0]["id"]
-                    logger.warning(f"Exact match not found. Using first result with ID: {company_id}")
+                company_id = _select_company_id(companies, ticker, exchange)
             
             if company_id is None:
                 logger.warning(f"Company not found in search results. Retrying...")
@@ -109,26 +146,9 @@ def fetch_company_data(ticker, exchange, api_token, max_retries=None):
     # Step 2: Fetch company details using the ID
     company_query = """
     query company($id: ID!) {
-      company(id: $id) {
-        id
-        name
-        exchangeSymbol
-        tickerSymbol
-        marketCapUSD
-        statements {
-          name
-          title
-          area
-          type
-          value
-          outcome
-          description
-          severity
-          outcomeName
-        }
-      }
+      company(id: $id) {%s      }
     }
-    """
+    """ % _COMPANY_FIELDS
     
     company_variables = {
         "id": company_id
@@ -207,9 +227,149 @@ def fetch_company_data(ticker, exchange, api_token, max_retries=None):
     
     return None  # Should never reach here but added for safety
 
+def _post_batch_query(query, variables, api_token, max_retries=None):
+    """Post a GraphQL document with retry logic and return its data.
+
+    Batched documents may partially succeed, so data is returned even
+    when the response also carries errors; aliases that failed are None.
+    Only network errors, rate limiting and server errors are retried.
+
+    Args:
+        query (str): GraphQL query document.
+        variables (dict): Query variables.
+        api_token (str): SimplyWall.st API token.
+        max_retries (int, optional): Maximum number of retries.
+            If None, uses the value from the configuration.
+
+    Returns:
+        dict: The response's data dictionary, or None if the request failed.
+    """
+    if max_retries is None:
+        max_retries = config["retry"]["max_retries"]
+    
+    retry_base_delay = config["retry"]["retry_base_delay"]
+    retry_max_delay = config["retry"]["retry_max_delay"]
+    
+    headers = {
+        "Authorization": f"Bearer {api_token}",
+        "Content-Type": "application/json"
+    }
+    
+    for retries in range(max_retries + 1):
+        try:
+            if retries > 0:
+                delay = min(retry_base_delay * (2 ** (retries - 1)) + random.uniform(0, 1), retry_max_delay)
+                logger.info(f"Batch retry attempt {retries}/{max_retries} after {delay:.2f}s delay...")
+                time.sleep(delay)
+            
+            response = requests.post(
+                config["api"]["sws_api_url"],
+                headers=headers,
+                json={"query": query, "variables": variables},
+                timeout=60
+            )
+            
+            logger.info(f"Batch response status code: {response.status_code}")
+            # Client errors other than rate limiting would fail the same way on
+            # every retry, so give up and let the caller fetch per stock
+            if 400 <= response.status_code < 500 and response.status_code != 429:
+                logger.error(f"Batch query rejected with status {response.status_code}, not retrying")
+                return None
+            response.raise_for_status()
+            
+            response_data = response.json()
+            
+            if "errors" in response_data:
+                logger.warning(f"GraphQL batch errors: {response_data['errors']}")
+            
+            # GraphQL errors such as a failed validation are deterministic too,
+            # so a response without data is not retried
+            return response_data.get("data")
+            
+        except Exception as e:
+            logger.error(f"Error posting batch query: {e}")
+    
+    logger.error(f"Batch query failed after {max_retries} retries")
+    return None
+
+def fetch_companies_batch(stock_infos, api_token):
+    """Fetch data for several companies with one search and one details request.
+
+    Each company is queried under its own alias (s0, s1, ... for the
+    search and c0, c1, ... for the details), so N companies cost two
+    HTTP round trips instead of 2N.
+
+    Args:
+        stock_infos (list): List of (stock name, ticker, exchange) tuples.
+        api_token (str): SimplyWall.st API token.
+
+    Returns:
+        dict: Dictionary mapping stock names to API response data for the
+            companies that were found. Missing companies are left out.
+    """
+    if not stock_infos:
+        return {}
+    
+    # Step 1: Search for all companies in one document
+    search_params = ", ".join(f"$q{i}: String!" for i in range(len(stock_infos)))
+    search_fields = "".join(
+        f"\n      s{i}: searchCompanies(query: $q{i}) {{{_SEARCH_FIELDS}      }}"
+        for i in range(len(stock_infos))
+    )
+    search_query = f"query batchSearch({search_params}) {{{search_fields}\n    }}"
+    search_variables = {
+        f"q{i}": f"{ticker} {exchange}" for i, (_, ticker, exchange) in enumerate(stock_infos)
+    }
+    
+    logger.info(f"Searching for {len(stock_infos)} companies in a single batch request...")
+    search_data = _post_batch_query(search_query, search_variables, api_token)
+    if search_data is None:
+        return {}
+    
+    company_ids = {}
+    for i, (name, ticker, exchange) in enumerate(stock_infos):
+        company_id = _select_company_id(search_data.get(f"s{i}") or [], ticker, exchange)
+        if company_id is not None:
+            company_ids[i] = company_id
+    
+    if not company_ids:
+        return {}
+    
+    # Step 2: Fetch all company details in one document
+    details_params = ", ".join(f"$id{i}: ID!" for i in company_ids)
+    details_fields = "".join(
+        f"\n      c{i}: company(id: $id{i}) {{{_COMPANY_FIELDS}      }}"
+        for i in company_ids
+    )
+    details_query = f"query batchCompanies({details_params}) {{{details_fields}\n    }}"
+    details_variables = {f"id{i}": company_id for i, company_id in company_ids.items()}
+    
+    logger.info(f"Fetching details for {len(company_ids)} companies in a single batch request...")
+    details_data = _post_batch_query(details_query, details_variables, api_token)
+    if details_data is None:
+        return {}
+    
+    # Split the aliased response back into the per-company structure
+    # that fetch_company_data returns
+    api_data = {}
+    for i in company_ids:
+        company = details_data.get(f"c{i}")
+        if company is not None:
+            api_data[stock_infos[i][0]] = {
+                "data": {
+                    "companyByExchangeAndTickerSymbol": company
+                }
+            }
+    
+    return api_data
+
 def fetch_all_companies(stocks, api_token):
     """Fetch data for all companies in the portfolio.
 
+    All companies are first requested in a single batch. Any company the
+    batch could not return is fetched individually so one failure does
+    not affect the others.
+
     Args:
         stocks (list): List of stock dictionaries.
         api_token (str): SimplyWall.st API token.
@@ -219,38 +379,45 @@ def fetch_all_companies(stocks, api_token):
     """
     from src.core.portfolio import get_stock_ticker_and_exchange
     
-    api_data = {}
-    
+    stock_infos = []
     for stock in stocks:
-        stock_info = get_stock_ticker_and_exchange(stock["name"])
+        # Stocks from parse_portfolio already carry their ticker and exchange
+        stock_info = stock if "ticker" in stock else get_stock_ticker_and_exchange(stock["name"])
         if stock_info:
-            ticker = stock_info["ticker"]
-            exchange = stock_info["exchange"]
-            logger.info(f"Fetching data for {stock['name']} ({ticker} on {exchange})...")
-            
+            stock_infos.append((stock["name"], stock_info["ticker"], stock_info["exchange"]))
+        else:
+            logger.warning(f"⚠️ No ticker/exchange found for {stock['name']}")
+    
+    batch_data = fetch_companies_batch(stock_infos, api_token)
+    
+    api_data = {}
+    
+    for name, ticker, exchange in stock_infos:
+        stock_data = batch_data.get(name)
+        if stock_data is None:
+            logger.info(f"Fetching data for {name} ({ticker} on {exchange})...")
             stock_data = fetch_company_data(ticker, exchange, api_token)
-            if stock_data:
-                # Safely check the response structure
-                has_valid_data = (
-                    isinstance(stock_data, dict) and 
-                    "data" in stock_data and 
-                    isinstance(stock_data["data"], dict) and
-                    "companyByExchangeAndTickerSymbol" in stock_data["data"] and
-                    stock_data["data"]["companyByExchangeAndTickerSymbol"] is not None
-                )
+        
+        if stock_data:
+            # Safely check the response structure
+            has_valid_data = (
+                isinstance(stock_data, dict) and 
+                "data" in stock_data and 
+                isinstance(stock_data["data"], dict) and
+                "companyByExchangeAndTickerSymbol" in stock_data["data"] and
+                stock_data["data"]["companyByExchangeAndTickerSymbol"] is not None
+            )
+            
+            if has_valid_data:
+                api_data[name] = stock_data
                 
-                if has_valid_data:
-                    api_data[stock["name"]] = stock_data
-                    
-                    company = stock_data["data"]["companyByExchangeAndTickerSymbol"]
-                    statement_count = len(company.get("statements", [])) if company else 0
-                    logger.info(f"✅ Successfully fetched data for {stock['name']}: {statement_count} statements")
-                else:
-                    logger.warning(f"⚠️ Data received for {stock['name']} but structure is not as expected")
-                    logger.debug(f"Response structure: {stock_data}")
+                company = stock_data["data"]["companyByExchangeAndTickerSymbol"]
+                statement_count = len(company.get("statements", [])) if company else 0
+                logger.info(f"✅ Successfully fetched data for {name}: {statement_count} statements")
             else:
-                logger.error(f"❌ Failed to fetch data for {stock['name']}")
+                logger.warning(f"⚠️ Data received for {name} but structure is not as expected")
+                logger.debug(f"Response structure: {stock_data}")
         else:
-            logger.warning(f"⚠️ No ticker/exchange found for {stock['name']}")
+            logger.error(f"❌ Failed to fetch data for {name}")
     
-    return api_data 
\ No newline at end of file
+    return api_data
@@ -0,0 +1,55 @@
+"""
+Regression tests for parsing AI analysis responses.
+
+Tests that the report sections are extracted into the same components.
+"""
+
+import unittest
+from src.models.parsers import extract_analysis_components
+
+ANALYSIS_RESPONSE = """# Allianz SE (ALV)
+
+## Recommendation
+Strong Buy
+
+## Summary
+Allianz is a leading European insurer.
+
+## Strengths
+- Diversified business
+
+## Competitive Analysis
+Wide moat in European insurance.
+
+## Price Analysis
+Current Price: €1,328.80
+
+#Risk Factors: Catastrophe losses.
+"""
+
+class TestAnalysisParsing(unittest.TestCase):
+    """Test the analysis response parser against regression issues."""
+
+    def test_extract_analysis_components(self):
+        """Test that present sections are extracted and missing ones left empty."""
+        components = extract_analysis_components(ANALYSIS_RESPONSE)
+
+        self.assertEqual(components["raw_response"], ANALYSIS_RESPONSE)
+        self.assertEqual(components["recommendation"], "BUY")
+        self.assertEqual(components["summary"], "Allianz is a leading European insurer.")
+        self.assertEqual(components["strengths"], ["Diversified business"])
+        self.assertEqual(components["weaknesses"], [])
+        self.assertEqual(components["competitive_analysis"], "Wide moat in European insurance.")
+        self.assertEqual(components["price_targets"], {"current_price": 1328.8})
+        self.assertEqual(components["risk_factors"], "Catastrophe losses.")
+        self.assertIsNone(components["rationale"])
+
+    def test_extract_analysis_components_case_insensitive(self):
+        """Test that section headers match regardless of case."""
+        components = extract_analysis_components("## recommendation: hold\n## SUMMARY\nSteady compounder.\n")
+
+        self.assertEqual(components["recommendation"], "HOLD")
+        self.assertEqual(components["summary"], "Steady compounder.")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Regression tests for batched SimplyWall.st API requests.
+
+Tests that batched responses are split back into per-company data and that
+companies missing from the batch fall back to individual requests without
+retrying failures that would repeat.
+"""
+
+import unittest
+from unittest.mock import patch, MagicMock
+from src.tools import api
+
+def mock_response(data, status_code=200, errors=None):
+    """Create a mock requests response returning the given GraphQL data."""
+    response = MagicMock()
+    response.status_code = status_code
+    if status_code >= 400:
+        response.raise_for_status.side_effect = api.requests.exceptions.HTTPError(f"{status_code} error")
+    response.json.return_value = {"data": data, "errors": errors} if errors else {"data": data}
+    return response
+
+class TestApiBatching(unittest.TestCase):
+    """Test the batched company fetching."""
+
+    def test_fetch_all_companies_batches_and_falls_back(self):
+        """Test that found companies come from the batch and the rest are fetched individually."""
+        search_data = {
+            "s0": [{"id": "msft-id", "name": "Microsoft", "exchangeSymbol": "NasdaqGS", "tickerSymbol": "MSFT"}],
+            "s1": []
+        }
+        details_data = {"c0": {"id": "msft-id", "name": "Microsoft", "statements": []}}
+        fallback_data = {"data": {"companyByExchangeAndTickerSymbol": {"name": "NVIDIA", "statements": []}}}
+
+        with patch.object(api.requests, "post", side_effect=[mock_response(search_data), mock_response(details_data)]) as mock_post, \
+             patch.object(api, "fetch_company_data", return_value=fallback_data) as mock_fetch:
+            api_data = api.fetch_all_companies([{"name": "Microsoft"}, {"name": "NVIDIA"}], "token")
+
+        self.assertEqual(mock_post.call_count, 2)
+        mock_fetch.assert_called_once_with("NVDA", "NasdaqGS", "token")
+        self.assertEqual(
+            api_data["Microsoft"]["data"]["companyByExchangeAndTickerSymbol"]["id"], "msft-id"
+        )
+        self.assertEqual(api_data["NVIDIA"], fallback_data)
+
+    def test_failed_batch_falls_back_without_retrying(self):
+        """Test that a rejected batch or a GraphQL error is not retried before the per-stock fallback."""
+        fallback_data = {"data": {"companyByExchangeAndTickerSymbol": {"name": "Microsoft", "statements": []}}}
+
+        for response in (mock_response(None, status_code=400),
+                         mock_response(None, errors=[{"message": "Cannot query field"}])):
+            with self.subTest(status_code=response.status_code), \
+                 patch.object(api.requests, "post", return_value=response) as mock_post, \
+                 patch.object(api.time, "sleep") as mock_sleep, \
+                 patch.object(api, "fetch_company_data", return_value=fallback_data) as mock_fetch:
+                api_data = api.fetch_all_companies([{"name": "Microsoft"}], "token")
+
+            mock_post.assert_called_once()
+            mock_sleep.assert_not_called()
+            mock_fetch.assert_called_once_with("MSFT", "NasdaqGS", "token")
+            self.assertEqual(api_data["Microsoft"], fallback_data)
+
+    def test_server_error_is_retried(self):
+        """Test that a transient server error is retried."""
+        search_data = {"s0": []}
+        with patch.object(api.requests, "post",
+                          side_effect=[mock_response(None, status_code=503), mock_response(search_data)]) as mock_post, \
+             patch.object(api.time, "sleep"), \
+             patch.object(api, "fetch_company_data", return_value=None):
+            api.fetch_all_companies([{"name": "Microsoft"}], "token")
+
+        self.assertEqual(mock_post.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+Regression tests for saving and loading JSON data.
+
+Tests that JSON files are written as the same UTF-8 bytes whether or not
+orjson is installed.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.core import file_operations
+
+DATA = {"name": "Münchener Rück", "price": {"currency": "€", "value": 1328}}
+
+class TestFileOperations(unittest.TestCase):
+    """Test the JSON file helpers against regression issues."""
+
+    def setUp(self):
+        """Create a temporary output directory."""
+        output_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(output_dir.cleanup)
+        self.output_dir = output_dir.name
+
+    def save(self, filename, orjson_module):
+        """Save DATA with the given orjson module (or None) and return the file bytes."""
+        filepath = os.path.join(self.output_dir, filename)
+        with patch.object(file_operations, "orjson", orjson_module):
+            self.assertTrue(file_operations.save_json_data(DATA, filepath))
+        with open(filepath, "rb") as f:
+            return filepath, f.read()
+
+    def test_stdlib_fallback_writes_utf8(self):
+        """Test that the json fallback writes UTF-8 text that loads back unchanged."""
+        filepath, content = self.save("fallback.json", None)
+
+        self.assertIn("Münchener Rück".encode("utf-8"), content)
+        self.assertIn("€".encode("utf-8"), content)
+        with patch.object(file_operations, "orjson", None):
+            self.assertEqual(file_operations.load_json_data(filepath), DATA)
+
+    @unittest.skipIf(file_operations.orjson is None, "orjson not installed")
+    def test_orjson_and_fallback_write_same_bytes(self):
+        """Test that both serializers produce the same file."""
+        _, orjson_content = self.save("orjson.json", file_operations.orjson)
+        _, fallback_content = self.save("fallback.json", None)
+
+        self.assertEqual(orjson_content, fallback_content)
+
+if __name__ == '__main__':
+    unittest.main()
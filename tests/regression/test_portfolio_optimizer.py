@@ -0,0 +1,203 @@
+"""
+Regression tests for the portfolio optimizer.
+
+Tests that bank CSV exports are parsed into the same summary and positions.
+"""
+
+import os
+import tempfile
+import unittest
+from src.core.portfolio_optimizer import (
+    parse_portfolio_csv, map_portfolio_to_analysis, optimize_portfolio, format_optimization_to_markdown,
+    index_analysis_by_ticker, determine_delimiter, format_changes_table, format_buy_recommendations,
+    format_sell_recommendations, categorize_positions, calculate_current_allocation, calculate_target_allocation,
+    calculate_allocation_changes
+)
+
+BANK_CSV = """Datum/Uhrzeit;11.04.2025/16:52:26
+Depot;461 481278000
+Anzahl der Positionen;2
+
+Position;Bezeichnung;WKN;ISIN;Bestand;Einstandskurs;Wert in EUR;Veränderung in %;Anteil im Depot
+1;ALLIANZ SE NA O.N.;840400;DE0008404005;193;248,27;63.458,40;+37,88;29,11
+2;NUTANIX INC. A;A2AS2Y;US67059N1081;40;55,1;2.204,00;-3,10;1,01
+
+Diese Aufstellung ist keine Abrechnung.
+"""
+
+COMBINED_CSV = """Security,ISIN,Shares,Current Price (EUR),Market Value (EUR),Weight,Change,Portfolio
+ALLIANZ SE NA O.N.,DE0008404005,51,328.80,16768.80,3.74%,"+1,556.52 (+10.23%)",Family
+"ADVANCED MIC.DEV.  DL-,01",US0079031078,42,80.80,3393.60,0.76%,"-1,069.32 (-23.96%)",Family
+"""
+
+class TestPortfolioOptimizer(unittest.TestCase):
+    """Test the portfolio optimizer against regression issues."""
+
+    def write_csv(self, content, newline=None):
+        """Write CSV content to a temporary file removed after the test."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", encoding="utf-8", newline=newline, delete=False) as temp_file:
+            temp_file.write(content)
+        self.addCleanup(os.unlink, temp_file.name)
+        return temp_file.name
+
+    def test_parse_bank_csv(self):
+        """Test that the semicolon export yields the summary, date and typed positions."""
+        portfolio_data = parse_portfolio_csv(self.write_csv(BANK_CSV))
+
+        self.assertEqual(portfolio_data["date"], "2025-04-11")
+        self.assertEqual(portfolio_data["summary"]["Anzahl der Positionen"], "2")
+        self.assertEqual(len(portfolio_data["positions"]), 2)
+        self.assertEqual(portfolio_data["positions"][0]["Bezeichnung"], "ALLIANZ SE NA O.N.")
+        self.assertEqual(portfolio_data["positions"][0]["Bestand"], 193)
+        self.assertEqual(portfolio_data["positions"][0]["Einstandskurs"], 248.27)
+        self.assertEqual(portfolio_data["positions"][0]["Wert in EUR"], 63458.4)
+        self.assertEqual(portfolio_data["positions"][0]["Veränderung in %"], 37.88)
+        self.assertEqual(portfolio_data["positions"][1]["Veränderung in %"], -3.1)
+        self.assertEqual(portfolio_data["positions"][1]["Anteil im Depot"], 1.01)
+
+    def test_parse_bank_csv_crlf(self):
+        """Test that Windows line endings parse like Unix ones."""
+        self.assertEqual(
+            parse_portfolio_csv(self.write_csv(BANK_CSV, newline="\r\n")),
+            parse_portfolio_csv(self.write_csv(BANK_CSV))
+        )
+
+    def test_parse_bank_csv_keeps_export_date(self):
+        """Test that dates in position rows near the top do not override the export date."""
+        csv_content = (
+            "Datum/Uhrzeit;16.03.2025/11:11:42\n"
+            "Position;Bezeichnung;WKN;ISIN;Datum letzter Umsatz\n"
+            "1;ALLIANZ SE NA O.N.;840400;DE0008404005;03.02.2025\n"
+        )
+        portfolio_data = parse_portfolio_csv(self.write_csv(csv_content))
+
+        self.assertEqual(portfolio_data["date"], "2025-03-16")
+        self.assertEqual(portfolio_data["positions"][0]["Datum letzter Umsatz"], "03.02.2025")
+
+    def test_parse_combined_csv(self):
+        """Test that quoted values in the comma-separated export are kept intact."""
+        portfolio_data = parse_portfolio_csv(self.write_csv(COMBINED_CSV))
+
+        self.assertEqual(len(portfolio_data["positions"]), 2)
+        self.assertEqual(portfolio_data["positions"][1]["Security"], "ADVANCED MIC.DEV.  DL-,01")
+        self.assertEqual(portfolio_data["positions"][1]["Shares"], 42)
+        self.assertEqual(portfolio_data["positions"][1]["Change"], "-1,069.32 (-23.96%)")
+
+    def test_optimize_portfolio(self):
+        """Test that buy/sell recommendations shift the target allocation."""
+        portfolio_data = {"positions": [
+            {"Bezeichnung": "ALLIANZ SE NA O.N.", "Anteil im Depot": 50.0, "Wert in EUR": 500.0},
+            {"Bezeichnung": "NUTANIX INC. A", "Anteil im Depot": 25.0, "Wert in EUR": 250.0},
+            {"Bezeichnung": "MICROSOFT    DL-,00000625", "Anteil im Depot": 25.0, "Wert in EUR": 250.0},
+            {"Bezeichnung": "UNKNOWN CORP.", "Anteil im Depot": 0.0, "Wert in EUR": 0.0}
+        ]}
+        analysis_results = [
+            {"ticker": "ALV", "recommendation": "Strong Buy"},
+            {"ticker": "NTNX", "recommendation": "SELL"},
+            {"ticker": "MSFT", "recommendation": "Neutral"}
+        ]
+        mapped_positions = map_portfolio_to_analysis(portfolio_data, analysis_results)
+        results = optimize_portfolio(mapped_positions)
+
+        self.assertEqual(results["total_value"], 1000.0)
+        self.assertEqual(list(results["target_allocation"]), ["ALV", "NTNX", "MSFT"])
+        self.assertAlmostEqual(results["target_allocation"]["ALV"], 75.0 / 1.125)
+        self.assertAlmostEqual(results["target_allocation"]["NTNX"], 12.5 / 1.125)
+        self.assertAlmostEqual(results["target_allocation"]["MSFT"], 25.0 / 1.125)
+        self.assertEqual([change["ticker"] for change in results["changes"]], ["ALV", "NTNX", "MSFT"])
+        self.assertAlmostEqual(results["changes"][1]["change_value"], (12.5 / 1.125 - 25.0) * 10)
+        self.assertEqual(results["current_allocation"]["MSFT"]["recommendation"], "Neutral")
+
+    def test_allocation_steps_match_optimize_portfolio(self):
+        """Test that the individual allocation steps give the same result as optimize_portfolio."""
+        mapped_positions = [
+            {"ticker": "ALV", "Bezeichnung": "ALLIANZ SE NA O.N.", "Anteil im Depot": 50.0, "Wert in EUR": 500.0,
+             "analysis": {"recommendation": "Strong Buy"}},
+            {"ticker": "NTNX", "Bezeichnung": "NUTANIX INC. A", "Anteil im Depot": 25.0, "Wert in EUR": 250.0,
+             "analysis": {"recommendation": "SELL"}},
+            {"ticker": "MSFT", "Bezeichnung": "MICROSOFT", "Anteil im Depot": 25.0, "Wert in EUR": 250.0,
+             "analysis": None}
+        ]
+        buys, holds, sells = categorize_positions(mapped_positions)
+        self.assertEqual([[p["ticker"] for p in group] for group in (buys, holds, sells)], [["ALV"], ["MSFT"], ["NTNX"]])
+
+        current_allocation = calculate_current_allocation(mapped_positions)
+        target_allocation = calculate_target_allocation(current_allocation)
+        changes = calculate_allocation_changes(current_allocation, target_allocation, 1000.0)
+        results = optimize_portfolio(mapped_positions, 1000.0)
+
+        self.assertEqual(current_allocation, results["current_allocation"])
+        self.assertEqual(target_allocation, results["target_allocation"])
+        self.assertEqual(changes, results["changes"])
+
+    def test_map_portfolio_to_prebuilt_index(self):
+        """Test that a prebuilt ticker index maps positions like the analysis list."""
+        analysis_results = [{"ticker": "ALV", "recommendation": "BUY"}, {"name": "No ticker"}]
+        analysis_by_ticker = index_analysis_by_ticker(analysis_results)
+        self.assertEqual(analysis_by_ticker, {"ALV": analysis_results[0]})
+
+        for analysis in (analysis_results, analysis_by_ticker):
+            mapped_positions = map_portfolio_to_analysis(
+                {"positions": [{"Bezeichnung": "ALLIANZ SE NA O.N."}, {"Bezeichnung": "UNKNOWN CORP."}, {}]},
+                analysis
+            )
+            self.assertEqual(mapped_positions, [
+                {"Bezeichnung": "ALLIANZ SE NA O.N.", "analysis": analysis_results[0], "ticker": "ALV"},
+                {"Bezeichnung": "UNKNOWN CORP.", "analysis": None}
+            ])
+
+    def test_format_optimization_to_markdown(self):
+        """Test that the report lists every change and the buy/sell action items."""
+        optimization_results = {
+            "total_value": 1000.0,
+            "changes": [
+                {"ticker": "ALV", "name": "ALLIANZ SE NA O.N.", "current_percent": 50.0, "target_percent": 60.0,
+                 "change_percent": 10.0, "change_value": 100.0, "recommendation": "BUY"},
+                {"ticker": "NTNX", "name": "NUTANIX INC. A", "current_percent": 25.0, "target_percent": 15.0,
+                 "change_percent": -10.0, "change_value": -100.0, "recommendation": "SELL"},
+                {"ticker": "MSFT", "name": "MICROSOFT", "current_percent": 25.0, "target_percent": 25.0,
+                 "change_percent": 0.0, "change_value": 0.0, "recommendation": "HOLD"}
+            ]
+        }
+        markdown = format_optimization_to_markdown(optimization_results, {"date": "2025-04-11", "positions": [{}, {}, {}]})
+
+        self.assertTrue(markdown.startswith("# Portfolio Optimization Recommendations\n\n## Portfolio Summary\n\nDate: 2025-04-11\n\n"))
+        self.assertIn("Total portfolio value: €1,000.00\nTotal positions: 3\n\n", markdown)
+        self.assertIn("| ALLIANZ SE NA O.N. | ALV | 50.00% | 60.00% | +10.00% | +100.00 | BUY |\n", markdown)
+        self.assertIn("| NUTANIX INC. A | NTNX | 25.00% | 15.00% | -10.00% | -100.00 | SELL |\n", markdown)
+        self.assertIn("- **ALLIANZ SE NA O.N. (ALV)**: Increase position by €100.00 (from 50.00% to 60.00%)\n", markdown)
+        self.assertIn("- **NUTANIX INC. A (NTNX)**: Reduce position by €100.00 (from 25.00% to 15.00%)\n", markdown)
+        self.assertNotIn("(MSFT)**", markdown)
+        self.assertTrue(markdown.endswith("Past performance is not indicative of future results.\n"))
+
+    def test_format_sections_from_changes(self):
+        """Test that the section formatters still take the change dicts."""
+        changes = [
+            {"ticker": "ALV", "name": "ALLIANZ SE NA O.N.", "current_percent": 50.0, "target_percent": 60.0,
+             "change_percent": 10.0, "change_value": 100.0, "recommendation": "BUY"},
+            {"ticker": "NTNX", "name": "NUTANIX INC. A", "current_percent": 25.0, "target_percent": 15.0,
+             "change_percent": -10.0, "change_value": -100.0, "recommendation": "SELL"}
+        ]
+
+        self.assertIn("| NUTANIX INC. A | NTNX | 25.00% | 15.00% | -10.00% | -100.00 | SELL |\n",
+                      format_changes_table(changes))
+        self.assertEqual(format_buy_recommendations(changes),
+                         "### Stocks to Buy/Increase\n\n- **ALLIANZ SE NA O.N. (ALV)**: Increase position by €100.00 "
+                         "(from 50.00% to 60.00%)\n  - *Rationale*: BUY\n\n")
+        self.assertTrue(format_sell_recommendations(changes).startswith(
+            "### Stocks to Sell/Reduce\n\n- **NUTANIX INC. A (NTNX)**: Reduce position by €100.00"))
+        self.assertEqual(format_sell_recommendations(changes[:1]), "")
+
+    def test_determine_delimiter(self):
+        """Test that any semicolon in the first line selects the semicolon delimiter."""
+        self.assertEqual(determine_delimiter(["Security,ISIN,Shares"]), ",")
+        self.assertEqual(determine_delimiter(["Datum/Uhrzeit;11.04.2025/16:52:26"]), ";")
+        self.assertEqual(determine_delimiter(["Name,Note,Value;1,2,3"]), ";")
+        self.assertEqual(determine_delimiter([]), ";")
+
+    def test_parse_missing_csv(self):
+        """Test that a missing CSV file returns None."""
+        self.assertIsNone(parse_portfolio_csv("nonexistent_portfolio.csv"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+Regression tests for the English portfolio CSV parser.
+
+Tests that combined_portfolio.csv rows are parsed into the same stock entries.
+"""
+
+import os
+import tempfile
+import unittest
+from src.core.portfolio_parser_english import parse_portfolio_csv_english
+
+PORTFOLIO_CSV = """Security,ISIN,Shares,Current Price (EUR),Market Value (EUR),Weight,Change,Portfolio
+ALLIANZ SE NA O.N.,DE0008404005,51,328.80,16768.80,3.74%,"+1,556.52 (+10.23%)",Family
+Cash EUR,,,,1000.00,0.22%,,Family
+NVIDIA,US67066G1040,30,,2700.00,,,Work
+UNKNOWN CORP.,XX0000000000,1,1.00,1.00,0.01%,,Work
+MICROSOFT    DL-,00000625,US5949181045,5
+
+"""
+
+class TestPortfolioParserEnglish(unittest.TestCase):
+    """Test the English portfolio parser against regression issues."""
+
+    def setUp(self):
+        """Write the sample portfolio to a temporary file."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", encoding="utf-8", delete=False) as temp_file:
+            temp_file.write(PORTFOLIO_CSV)
+            self.portfolio_file = temp_file.name
+
+    def tearDown(self):
+        """Remove the temporary portfolio file."""
+        os.unlink(self.portfolio_file)
+
+    def test_parse_portfolio_rows(self):
+        """Test that mapped rows are parsed and cash, unmapped and incomplete rows skipped."""
+        portfolio_data = parse_portfolio_csv_english(self.portfolio_file)
+
+        self.assertEqual(portfolio_data["stocks"], [
+            {"name": "ALLIANZ SE NA O.N.", "ticker": "ALV", "exchange": "XTRA", "shares": 51,
+             "price": 328.8, "value": 16768.8, "weight": 3.74, "portfolio": "Family"},
+            {"name": "NVIDIA", "ticker": "NVDA", "exchange": "NasdaqGS", "shares": 30,
+             "price": 0, "value": 2700.0, "weight": 0, "portfolio": "Work"}
+        ])
+        self.assertAlmostEqual(portfolio_data["total_value"], 19468.8)
+
+    def test_parse_missing_csv(self):
+        """Test that a missing CSV file returns None."""
+        self.assertIsNone(parse_portfolio_csv_english("nonexistent_portfolio.csv"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Regression tests for portfolio markdown parsing.
+
+Tests that the portfolio table parser keeps producing the same stock rows.
+"""
+
+import os
+import tempfile
+import unittest
+from src.core import portfolio
+from src.core.portfolio import parse_portfolio
+
+PORTFOLIO_MARKDOWN = """| Security | Shares | Current Price | Market Value | Weight |
+|---|---|---|---|---|
+| Rheinmetall AG | 3 | 1375.00 | 4125 | 3.41% |
+| NVIDIA | 30 | 925.17 | 27,755.1 | 22.89% |
+| Unknown Holding | 1 | 10.00 | 10 | 0.01% |
+| Cash EUR | 0 | 1.00 | 1000 | 0.83% |
+"""
+
+class TestPortfolioParsing(unittest.TestCase):
+    """Test the portfolio parser against regression issues."""
+
+    def setUp(self):
+        """Write the sample portfolio to a temporary file."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".md", delete=False) as temp_file:
+            temp_file.write(PORTFOLIO_MARKDOWN)
+            self.portfolio_file = temp_file.name
+
+    def tearDown(self):
+        """Remove the temporary portfolio file."""
+        os.unlink(self.portfolio_file)
+
+    def test_parse_portfolio_rows(self):
+        """Test that data rows are parsed and header, separator, cash and unmapped rows skipped."""
+        stocks = parse_portfolio(self.portfolio_file)
+
+        self.assertEqual(len(stocks), 2)
+        self.assertEqual(stocks[0], {
+            "name": "Rheinmetall AG",
+            "ticker": "RHM",
+            "exchange": "XTRA",
+            "shares": 3,
+            "current_price": 1375.0,
+            "market_value": 4125.0,
+            "weight": 3.41
+        })
+        self.assertEqual(stocks[1]["name"], "NVIDIA")
+        self.assertEqual(stocks[1]["market_value"], 27755.1)
+
+    def test_parse_portfolio_cache(self):
+        """Test that cached results are copies and refresh when the file changes."""
+        stocks = parse_portfolio(self.portfolio_file)
+        stocks[0]["shares"] = 999
+        self.assertEqual(parse_portfolio(self.portfolio_file)[0]["shares"], 3)
+
+        with open(self.portfolio_file, "a") as f:
+            f.write("| Microsoft | 5 | 200.0 | 1000.0 | 50% |\n")
+        stat = os.stat(self.portfolio_file)
+        os.utime(self.portfolio_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        stocks = parse_portfolio(self.portfolio_file)
+        self.assertEqual(len(stocks), 3)
+        self.assertEqual(stocks[2]["name"], "Microsoft")
+
+    def test_parse_portfolio_malformed_row(self):
+        """Test that a row with unparseable numbers is logged and skipped."""
+        with open(self.portfolio_file, "a") as f:
+            f.write("| Microsoft | N/A | 200.0 | 1000.0 | 50% |\n")
+
+        with self.assertLogs(portfolio.logger, "ERROR") as logs:
+            stocks = parse_portfolio(self.portfolio_file)
+
+        self.assertEqual(len(stocks), 2)
+        self.assertIn("Error parsing row for Microsoft", logs.output[-1])
+
+    def test_unmapped_stock_reported_once(self):
+        """Test that an unmapped stock is reported by a single warning."""
+        portfolio.get_stock_ticker_and_exchange.cache_clear()
+
+        with self.assertLogs(portfolio.logger, "WARNING") as logs:
+            parse_portfolio(self.portfolio_file)
+
+        unmapped = [record for record in logs.records if "Unknown Holding" in record.getMessage()]
+        self.assertEqual([record.levelname for record in unmapped], ["WARNING"])
+
+    def test_parse_portfolio_row_without_closing_pipe(self):
+        """Test that a row without the trailing pipe is still parsed."""
+        with open(self.portfolio_file, "a") as f:
+            f.write("| Microsoft | 5 | 200.0 | 1000.0 | 50%\n")
+
+        stocks = parse_portfolio(self.portfolio_file)
+
+        self.assertEqual(len(stocks), 3)
+        self.assertEqual(stocks[2]["name"], "Microsoft")
+        self.assertEqual(stocks[2]["weight"], 50.0)
+
+    def test_parse_portfolio_file_not_found(self):
+        """Test that a missing portfolio file returns an empty list."""
+        self.assertEqual(parse_portfolio("nonexistent_portfolio.md"), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Regression tests for the AI response cache.
+
+Tests that identical requests are answered from the cache and that failed
+or truncated requests are not cached.
+"""
+
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+from src.models import response_cache
+from src.models.openai.openai_analysis import analyze_with_openai
+
+def mock_client(content=None, error=None, finish_reason="stop"):
+    """Create a mock OpenAI client returning the given content or raising the given error."""
+    client = MagicMock()
+    if error:
+        client.chat.completions.create.side_effect = error
+    else:
+        choice = client.chat.completions.create.return_value.choices[0]
+        choice.message.content = content
+        choice.finish_reason = finish_reason
+    return client
+
+class TestResponseCache(unittest.TestCase):
+    """Test the response cache against regression issues."""
+
+    def setUp(self):
+        """Point the cache at a temporary directory."""
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        output_config = dict(response_cache.config["output"], response_cache_dir=cache_dir.name)
+        patcher = patch.dict(response_cache.config, {"output": output_config})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_save_and_load_response(self):
+        """Test that a saved response is found only for the same request."""
+        self.assertIsNone(response_cache.load_cached_response("model", "prompt"))
+        self.assertTrue(response_cache.save_cached_response("## Recommendation\nBUY", "model", "prompt"))
+
+        self.assertEqual(response_cache.load_cached_response("model", "prompt"), "## Recommendation\nBUY")
+        self.assertIsNone(response_cache.load_cached_response("model", "other prompt"))
+
+    def test_analyze_with_openai_uses_cache(self):
+        """Test that repeated requests reuse the response unless the cache is bypassed."""
+        self.assertEqual(analyze_with_openai("system", "user", mock_client("first")), "first")
+
+        client = mock_client("second")
+        self.assertEqual(analyze_with_openai("system", "user", client), "first")
+        client.chat.completions.create.assert_not_called()
+
+        self.assertEqual(analyze_with_openai("system", "user", client, use_cache=False), "second")
+        self.assertEqual(analyze_with_openai("system", "user", mock_client("third")), "second")
+
+    def test_cached_response_skips_before_request(self):
+        """Test that the pre-request hook only runs when the API is actually called."""
+        before_request = MagicMock()
+        analyze_with_openai("system", "user", mock_client("first"), before_request=before_request)
+        before_request.assert_called_once()
+
+        before_request.reset_mock()
+        self.assertEqual(analyze_with_openai("system", "user", mock_client("second"), before_request=before_request),
+                         "first")
+        before_request.assert_not_called()
+
+    def test_errors_are_not_cached(self):
+        """Test that an error response is not reused by the next request."""
+        self.assertEqual(analyze_with_openai("system", "user", mock_client(error=RuntimeError("rate limited"))),
+                         "Error: rate limited")
+        self.assertEqual(analyze_with_openai("system", "user", mock_client("fresh")), "fresh")
+
+    def test_truncated_responses_are_not_cached(self):
+        """Test that a response cut off at the token limit is not reused."""
+        self.assertEqual(analyze_with_openai("system", "user", mock_client("cut off", finish_reason="length")),
+                         "cut off")
+        self.assertEqual(analyze_with_openai("system", "user", mock_client("complete")), "complete")
+
+if __name__ == '__main__':
+    unittest.main()
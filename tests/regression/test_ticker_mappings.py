@@ -47,5 +47,22 @@ class TestTickerMappings(unittest.TestCase):
                 self.assertIsNotNone(result, f"Company name lookup failed for {name}")
                 self.assertEqual(result["ticker"], expected_ticker)
     
+    def test_normalized_name_lookup(self):
+        """Test that case, whitespace, punctuation and suffix variants resolve to the same ticker."""
+        variants = {
+            "rheinmetall ag": "RHM",
+            "NVIDIA CORP. DL-,001": "NVDA",
+            "ALPHABET INC.CL C DL-,001": "GOOG",
+            "  Microsoft ": "MSFT",
+            "NVIDIA CORP. DL-,01": "NVDA",
+            "TAIWAN SEMICON.MANU.ADR/1": "TSM"
+        }
+        
+        for name, expected_ticker in variants.items():
+            with self.subTest(name=name):
+                result = get_stock_ticker_and_exchange(name)
+                self.assertIsNotNone(result, f"Normalized lookup failed for {name}")
+                self.assertEqual(result["ticker"], expected_ticker)
+    
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+Regression tests for the per-stock AI analysis.
+
+Tests that concurrently analyzed stocks are returned in portfolio order,
+that API data is found under keys containing the company name, that
+stocks without API data are skipped and that prompts are built once.
+"""
+
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.models import analysis
+
+def mock_analysis(system_prompt, user_prompt, client, model, use_cache=True, before_request=None):
+    """Return a canned analysis naming the company from the prompt."""
+    recommendation = "SELL" if "NVIDIA" in user_prompt else "BUY"
+    return f"## Recommendation\n{recommendation}\n"
+
+class TestValueInvestingSignals(unittest.TestCase):
+    """Test the concurrent stock analysis."""
+
+    def test_analyses_keep_portfolio_order(self):
+        """Test that results follow the portfolio order and unknown stocks are skipped."""
+        portfolio_data = [
+            {"name": "Microsoft", "ticker": "MSFT", "exchange": "NasdaqGS"},
+            {"name": "Missing Corp", "ticker": "MISS", "exchange": "NYSE"},
+            {"name": "NVIDIA", "ticker": "NVDA", "exchange": "NasdaqGS"}
+        ]
+        api_data = {"MSFT": {"name": "Microsoft"}, "NVIDIA Corporation": {"name": "NVIDIA"}}
+        output_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(output_dir.cleanup)
+        test_config = dict(analysis.config, analysis={"max_workers": 2, "request_interval": 0})
+        test_config["output"] = dict(analysis.config["output"], companies_dir=output_dir.name)
+
+        with patch.dict(analysis.config, test_config), \
+             patch.object(analysis, "build_analysis_prompt", side_effect=lambda data: data["name"]), \
+             patch.object(analysis, "analyze_with_openai", side_effect=mock_analysis), \
+             patch.object(analysis, "save_markdown"), \
+             patch.object(analysis, "save_json_data") as mock_save_json:
+            results = analysis.get_value_investing_signals(portfolio_data, api_data)
+
+        self.assertEqual([stock["ticker"] for stock in results["stocks"]], ["MSFT", "NVDA"])
+        self.assertEqual(mock_save_json.call_count, 2)
+
+    def test_concurrent_claude_analyses_hide_progress(self):
+        """Test that streaming progress is only printed when stocks are analyzed one at a time."""
+        output_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(output_dir.cleanup)
+
+        for max_workers, show_progress in ((2, False), (1, True)):
+            test_config = dict(analysis.config, analysis={"max_workers": max_workers, "request_interval": 0})
+            test_config["output"] = dict(analysis.config["output"], companies_dir=output_dir.name)
+            with self.subTest(max_workers=max_workers), \
+                 patch.dict(analysis.config, test_config), \
+                 patch.object(analysis, "build_analysis_prompt", side_effect=lambda data: data["name"]), \
+                 patch.object(analysis, "analyze_with_claude", return_value="## Recommendation\nBUY\n") as mock_claude, \
+                 patch.object(analysis, "save_markdown"), \
+                 patch.object(analysis, "save_json_data"):
+                analysis.get_value_investing_signals(
+                    [{"name": "Microsoft", "ticker": "MSFT", "exchange": "NasdaqGS"}], {"MSFT": {"name": "Microsoft"}},
+                    model="claude-3-7"
+                )
+
+            self.assertEqual(mock_claude.call_args.kwargs["show_progress"], show_progress)
+
+    def test_markdown_rendered_on_access(self):
+        """Test that the summary markdown is only rendered when the key is read."""
+        output_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(output_dir.cleanup)
+        test_config = dict(analysis.config, analysis={"max_workers": 1, "request_interval": 0})
+        test_config["output"] = dict(analysis.config["output"], companies_dir=output_dir.name)
+
+        with patch.dict(analysis.config, test_config), \
+             patch.object(analysis, "build_analysis_prompt", side_effect=lambda data: data["name"]), \
+             patch.object(analysis, "analyze_with_openai", side_effect=mock_analysis), \
+             patch.object(analysis, "save_markdown"), \
+             patch.object(analysis, "save_json_data"), \
+             patch.object(analysis, "format_analysis_to_markdown", return_value="# Report\n") as mock_format:
+            results = analysis.get_value_investing_signals(
+                [{"name": "Microsoft", "ticker": "MSFT", "exchange": "NasdaqGS"}], {"MSFT": {"name": "Microsoft"}}
+            )
+            mock_format.assert_not_called()
+
+            self.assertIn("markdown", results)
+            self.assertEqual(results["markdown"], "# Report\n")
+            self.assertEqual(results.get("markdown"), "# Report\n")
+            mock_format.assert_called_with(results["stocks"])
+
+    def test_prompt_built_once_per_company(self):
+        """Test that a company held in two portfolios gets its prompt built only once."""
+        portfolio_data = [
+            {"name": "Microsoft", "ticker": "MSFT", "exchange": "NasdaqGS", "portfolio": "Family"},
+            {"name": "Microsoft", "ticker": "MSFT", "exchange": "NasdaqGS", "portfolio": "Work"}
+        ]
+        output_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(output_dir.cleanup)
+        test_config = dict(analysis.config, analysis={"max_workers": 2, "request_interval": 0})
+        test_config["output"] = dict(analysis.config["output"], companies_dir=output_dir.name)
+
+        with patch.dict(analysis.config, test_config), \
+             patch.object(analysis, "build_analysis_prompt", side_effect=lambda data: data["name"]) as mock_build, \
+             patch.object(analysis, "analyze_with_openai", side_effect=mock_analysis), \
+             patch.object(analysis, "save_markdown"), \
+             patch.object(analysis, "save_json_data"):
+            results = analysis.get_value_investing_signals(portfolio_data, {"MSFT": {"name": "Microsoft"}})
+
+        mock_build.assert_called_once()
+        self.assertEqual(len(results["stocks"]), 2)
+
+if __name__ == '__main__':
+    unittest.main()